@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+# Настройки без файла infra/.env: БД задается параметром --db-url
+os.environ.setdefault('IS_DOCKER', 'docker')
+for name, value in (
+    ('POSTGRES_USER', 'bench'),
+    ('POSTGRES_PASSWORD', 'bench'),
+    ('POSTGRES_DB', 'bench'),
+    ('POSTGRES_SERVER', 'localhost'),
+    ('POSTGRES_PORT', '5432'),
+):
+    os.environ.setdefault(name, value)
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from loguru import logger  # noqa: E402
+
+from core.db import db_manager  # noqa: E402
+from models import Base  # noqa: E402
+
+
+def parse_args(description: str, **arguments: dict[str, Any]) -> argparse.Namespace:
+    """Разбор параметров командной строки замера.
+
+    Общий параметр --db-url - URL БД. По умолчанию используется SQLite во временном файле;
+    для PostgreSQL нужна отдельная БД: таблицы приложения в ней создаются заново.
+
+    Args:
+        description (str): описание замера
+        arguments (dict[str, Any]): дополнительные параметры: имя - аргументы add_argument
+
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--db-url', default=None, help='URL БД, например postgresql+asyncpg://...')
+    for name, options in arguments.items():
+        parser.add_argument(f'--{name.replace("_", "-")}', **options)
+    return parser.parse_args()
+
+
+def run(main: Callable[[argparse.Namespace], Awaitable[None]], args: argparse.Namespace) -> None:
+    """Запуск замера с подготовленной БД и закрытием соединений после него."""
+
+    async def wrapper() -> None:
+        logger.remove()
+        with tempfile.TemporaryDirectory() as directory:
+            if args.db_url:
+                db_manager.init(db_url=args.db_url)
+            else:
+                # SQLite допускает одну пишущую транзакцию: одно соединение исключает ошибки блокировки
+                db_manager.init(
+                    db_url=f'sqlite+aiosqlite:///{Path(directory) / "bench.db"}',
+                    pool_size=1,
+                    max_overflow=0,
+                )
+            try:
+                async with db_manager.connect() as connection:
+                    await connection.run_sync(Base.metadata.drop_all)
+                    await connection.run_sync(Base.metadata.create_all)
+                await main(args)
+            finally:
+                await db_manager.close()
+
+    asyncio.run(wrapper())
+
+
+async def measure(call: Callable[[], Awaitable[Any]], count: int, warmup: int = 20) -> float:
+    """Среднее время вызова call, сек."""
+    for _ in range(warmup):
+        await call()
+    start = time.perf_counter()
+    for _ in range(count):
+        await call()
+    return (time.perf_counter() - start) / count
+
+
+def measure_sync(call: Callable[[], Any], count: int, warmup: int = 500) -> float:
+    """Среднее время синхронного вызова call, сек."""
+    for _ in range(warmup):
+        call()
+    start = time.perf_counter()
+    for _ in range(count):
+        call()
+    return (time.perf_counter() - start) / count
+
+
+def app_client() -> Any:
+    """HTTP клиент приложения FastAPI без сервера (httpx.AsyncClient)."""
+    import httpx
+
+    from api.fastapi_app import get_fastapi_app
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=get_fastapi_app()), base_url='http://bench')
@@ -0,0 +1,56 @@
+"""Подсчет X-Total-Count: точный COUNT(*) против оценки по статистике PostgreSQL.
+
+Запуск: python benchmarks/count_modes.py --db-url postgresql+asyncpg://... [--rows N]
+
+Оценка (режимы 'estimated' и 'auto') поддерживается только PostgreSQL; в других БД
+все режимы выполняют точный подсчет, и замер показывает только его.
+"""
+
+import argparse
+
+from common import db_manager, measure, parse_args, run
+
+FILTERS = (
+    ('без фильтра', {}),
+    ('name__prefix', {'name__prefix': 'user1'}),
+    ('full_name', {'full_name': 'Полное имя 7'}),
+)
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Замер."""
+    from sqlalchemy import text
+
+    from dao.user_dao import user_dao
+
+    copied, _ = await user_dao.copy_from(
+        ((f'user{i}', f'Полное имя {i % 10}') for i in range(args.rows)),
+        columns=('name', 'full_name'),
+    )
+    async with db_manager.connect() as connection:
+        if connection.dialect.name == 'postgresql':
+            await connection.execute(text(f'ANALYZE {user_dao.model.__tablename__}'))
+    print(f'записей: {copied}')
+
+    async with db_manager.session_read_only() as session:
+        for name, filter_params in FILTERS:
+            exact = await user_dao.count(session=session, filter_params=filter_params, mode='exact')
+            for mode in ('exact', 'estimated', 'auto'):
+                total = await user_dao.count(session=session, filter_params=filter_params, mode=mode)
+
+                async def call(mode: str = mode, filter_params: dict = filter_params) -> None:
+                    await user_dao.count(session=session, filter_params=filter_params, mode=mode)
+
+                elapsed = await measure(call, args.count, warmup=3)
+                print(f'{name:14} {mode:9} {elapsed * 1e3:8.2f} мс  {total} (точно {exact})')
+
+
+if __name__ == '__main__':
+    run(
+        main,
+        parse_args(
+            __doc__,
+            rows={'type': int, 'default': 1_000_000, 'help': 'число записей в таблице'},
+            count={'type': int, 'default': 20, 'help': 'число подсчетов при замере'},
+        ),
+    )
@@ -0,0 +1,63 @@
+"""Построение запросов с фильтром в BaseDAO: кэш запросов против построения при каждом вызове.
+
+Запуск: python benchmarks/filter_statements.py [--db-url URL] [--dao-only]
+
+С --dao-only замеряются только вызовы DAO (find_one_or_none, find_all), которые
+есть и в версиях без кэша запросов: так сравниваются версии до и после него.
+"""
+
+import argparse
+
+from common import db_manager, measure, measure_sync, parse_args, run
+
+FILTER = {'name': 'user3', 'full_name': 'Полное имя'}
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Замер."""
+    from sqlalchemy import select
+
+    from dao.user_dao import user_dao
+    from models import User
+    from schemas.user import UserCreate
+
+    columns = User.__table__.columns
+
+    def build_each_time() -> None:
+        # Проверка фильтра и построение запроса до кэша запросов BaseDAO
+        [key for key in FILTER if key not in columns.keys()]
+        select(User).filter_by(**FILTER)._generate_cache_key()
+
+    def cached() -> None:
+        user_dao.check_filter_params(FILTER)
+        statement, _ = user_dao._filter_statement(('all',), FILTER, lambda: select(User))
+        statement._generate_cache_key()
+
+    def check() -> None:
+        user_dao.check_filter_params(FILTER)
+
+    if not args.dao_only:
+        for name, call in (('построение при каждом вызове', build_each_time), ('кэш запросов', cached)):
+            print(f'проверка + запрос + ключ кэша, {name}: {measure_sync(call, args.count) * 1e6:.2f} мкс')
+        print(f'check_filter_params: {measure_sync(check, args.count) * 1e6:.2f} мкс')
+
+    async with db_manager.session_with_commit() as session:
+        for i in range(10):
+            await user_dao.create(session, UserCreate(name=f'user{i}', full_name='Полное имя'))
+    async with db_manager.session_read_only() as session:
+        for name, call in (
+            ('find_one_or_none', lambda: user_dao.find_one_or_none(session, FILTER)),
+            ('find_all', lambda: user_dao.find_all(session, FILTER)),
+        ):
+            print(f'{name}: {await measure(call, args.count // 10) * 1e6:.0f} мкс')
+
+
+if __name__ == '__main__':
+    run(
+        main,
+        parse_args(
+            __doc__,
+            count={'type': int, 'default': 20_000, 'help': 'число вызовов при замере'},
+            dao_only={'action': 'store_true', 'help': 'только вызовы DAO'},
+        ),
+    )
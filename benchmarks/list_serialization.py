@@ -0,0 +1,83 @@
+"""Сериализация страницы списка: ORM объекты и Page[UserDB] против строк выборки и RowSerializer.
+
+Запуск: python benchmarks/list_serialization.py [--db-url URL] [--page-size N]
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Awaitable, Callable
+
+from common import db_manager, parse_args, run
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Замер."""
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from core.serializers import get_serializer
+    from dao.user_dao import user_dao
+    from models import User
+    from schemas.pagination import Page
+    from schemas.user import UserDB
+
+    async with db_manager.session_with_commit() as session:
+        created_at = datetime(2025, 1, 1)
+        session.add_all(
+            [
+                User(
+                    name=f'user{i}',
+                    full_name=f'Полное имя {i}',
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+                for i in range(args.page_size)
+            ],
+        )
+
+    async def orm_page() -> bytes:
+        # Как FastAPI обрабатывает ответ с response_model=Page[UserDB]
+        async with db_manager.session_read_only() as session:
+            items, cursor = await user_dao.find_page(session=session, limit=args.page_size)
+            page = Page[UserDB](items=items, next_cursor=cursor)
+            return JSONResponse(jsonable_encoder(page)).body
+
+    serializer = get_serializer(User.__table__, tuple(UserDB.model_fields))
+
+    async def raw_page() -> bytes:
+        async with db_manager.session_read_only() as session:
+            rows, cursor = await user_dao.find_page(session=session, limit=args.page_size, raw=True)
+            return serializer.dumps_page(rows, cursor)
+
+    bodies = [await report(name, call, args) for name, call in (('ORM', orm_page), ('строки', raw_page))]
+    print(f'ответы совпадают: {bodies[0] == bodies[1]}')
+
+
+async def report(name: str, call: Callable[[], Awaitable[bytes]], args: argparse.Namespace) -> bytes:
+    """Замер скорости и пика памяти на запись для одного способа сериализации."""
+    for _ in range(5):
+        await call()
+    start = time.perf_counter()
+    for _ in range(args.count):
+        await call()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    body = await call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rows = args.count * args.page_size
+    print(f'{name}: {rows / elapsed:,.0f} записей/с, пик памяти {peak / args.page_size:.0f} Б/запись')
+    return body
+
+
+if __name__ == '__main__':
+    run(
+        main,
+        parse_args(
+            __doc__,
+            page_size={'type': int, 'default': 500, 'help': 'размер страницы'},
+            count={'type': int, 'default': 40, 'help': 'число страниц при замере'},
+        ),
+    )
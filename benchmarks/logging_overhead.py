@@ -0,0 +1,66 @@
+"""Затраты логирования на горячем пути: без обработчиков против настроек приложения (main.loger_config).
+
+Запуск: python benchmarks/logging_overhead.py [--db-url URL] [--sinks none|config] > bench.out
+
+С --sinks config логи пишутся как в приложении: в stdout (поэтому его лучше
+перенаправить в файл) и в src/log. Для сравнения версий до и после изменений
+логирования скрипт запускается на каждой из них.
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from common import app_client, db_manager, measure, parse_args, run
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Замер."""
+    from loguru import logger
+
+    from dao.cache import EntityCache, LRUTTLCache
+    from dao.user_dao import user_dao
+    from models import User
+
+    user_dao.cache = EntityCache(LRUTTLCache(maxsize=1000, ttl=600))
+    async with db_manager.session_with_commit() as session:
+        created_at = datetime(2025, 1, 1)
+        session.add_all(
+            [
+                User(name=f'u{i}', full_name='x', created_at=created_at, updated_at=created_at)
+                for i in range(50)
+            ],
+        )
+    if args.sinks == 'config':
+        import main as app_main
+
+        app_main.loger_config()
+
+    async def dao_call() -> None:
+        async with db_manager.session_read_only() as session:
+            for obj_id in range(1, 11):
+                await user_dao.get_one_or_none_by_id(session=session, obj_id=obj_id)
+
+    async with app_client() as client:
+
+        async def http_call() -> None:
+            await client.get('/api_v1/users/', params={'limit': 10, 'name__prefix': 'u1', 'count': 'exact'})
+
+        for name, call in (
+            ('1 сессия + 10 get_one_or_none_by_id из кэша', dao_call),
+            ('GET /users (страница + count)', http_call),
+        ):
+            elapsed = await measure(call, args.count, warmup=30)
+            print(f'{args.sinks:6} {name}: {elapsed * 1e6:8.0f} мкс', file=sys.stderr)
+    await logger.complete()
+
+
+if __name__ == '__main__':
+    run(
+        main,
+        parse_args(
+            __doc__,
+            sinks={'choices': ('none', 'config'), 'default': 'config', 'help': 'обработчики логов'},
+            count={'type': int, 'default': 400, 'help': 'число вызовов при замере'},
+        ),
+    )
@@ -0,0 +1,62 @@
+"""Одновременное создание пользователей: INSERT на каждый запрос против пакетной записи (WriteBatcher).
+
+Запуск: python benchmarks/write_batching.py [--db-url URL] [--concurrency N] [--requests N]
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+
+from common import app_client, parse_args, run
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Замер."""
+    from dao.user_dao import user_dao
+    from dao.write_batch import WriteBatcher
+
+    counter = itertools.count()
+    async with app_client() as client:
+
+        async def worker(count: int, latencies: list[float] | None) -> None:
+            for _ in range(count):
+                start = time.perf_counter()
+                response = await client.post(
+                    '/api_v1/users/',
+                    json={'name': f'n{next(counter)}', 'full_name': 'x'},
+                )
+                response.raise_for_status()
+                if latencies is not None:
+                    latencies.append(time.perf_counter() - start)
+
+        for name, batcher in (
+            ('по запросу', None),
+            ('пакетами', WriteBatcher(window=args.window, max_size=args.max_size)),
+        ):
+            user_dao.write_batcher = batcher
+            await asyncio.gather(*(worker(10, None) for _ in range(8)))
+            latencies: list[float] = []
+            start = time.perf_counter()
+            per_worker = args.requests // args.concurrency
+            await asyncio.gather(*(worker(per_worker, latencies) for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - start
+            latencies.sort()
+            print(
+                f'{name:10} {len(latencies) / elapsed:7.0f} вставок/с'
+                f'  p50 {latencies[len(latencies) // 2] * 1e3:6.1f} мс'
+                f'  p99 {latencies[int(len(latencies) * 0.99)] * 1e3:6.1f} мс',
+            )
+
+
+if __name__ == '__main__':
+    run(
+        main,
+        parse_args(
+            __doc__,
+            concurrency={'type': int, 'default': 64, 'help': 'число одновременных клиентов'},
+            requests={'type': int, 'default': 3200, 'help': 'общее число запросов'},
+            window={'type': float, 'default': 0.002, 'help': 'DB_WRITE_BATCH_WINDOW, сек.'},
+            max_size={'type': int, 'default': 100, 'help': 'DB_WRITE_BATCH_MAX_SIZE'},
+        ),
+    )
@@ -0,0 +1,130 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Mapping, Sequence
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from dao.base_dao import BaseDAO
+
+# Ответ можно хранить, но перед использованием нужно проверить у сервера (If-None-Match)
+CACHE_CONTROL = 'no-cache'
+
+# Поля записей, по которым вычисляются валидаторы страницы списка (page_validators)
+PAGE_VALIDATOR_FIELDS = ('id', 'updated_at')
+
+
+class Validators:
+    """Валидаторы представления ресурса для условных запросов: ETag и Last-Modified."""
+
+    __slots__ = ('etag', 'last_modified')
+
+    def __init__(self, etag: str, last_modified: datetime | None) -> None:  # noqa: D107
+        self.etag = etag
+        self.last_modified = _as_utc(last_modified) if last_modified is not None else None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Заголовки ответа с валидаторами."""
+        headers = {'ETag': self.etag, 'Cache-Control': CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers['Last-Modified'] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Время в UTC; время без часового пояса (колонки TIMESTAMP) считается временем UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def make_etag(*parts: Any) -> str:
+    """Слабый ETag из значений, определяющих представление ресурса.
+
+    В ETag входит версия приложения, поэтому изменение формата ответа
+    при обновлении приложения не приводит к ответу 304 на старый ETag.
+    """
+    source = '|'.join(str(part) for part in (settings.app_version, *parts))
+    return f'W/"{hashlib.blake2b(source.encode(), digest_size=16).hexdigest()}"'
+
+
+def has_conditions(request: Request) -> bool:
+    """Является ли запрос условным (If-None-Match или If-Modified-Since)."""
+    return 'if-none-match' in request.headers or 'if-modified-since' in request.headers
+
+
+def is_not_modified(request: Request, validators: Validators, use_last_modified: bool = True) -> bool:
+    """Не изменилось ли представление ресурса с копии клиента (ответ 304).
+
+    If-None-Match сравнивается со слабым ETag; если он передан, If-Modified-Since
+    не учитывается (RFC 9110, 13.2.2). Last-Modified сравнивается с точностью до секунды.
+
+    Args:
+        request (Request): запрос
+        validators (Validators): валидаторы текущего представления
+        use_last_modified (bool): учитывать If-Modified-Since
+
+    """
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        if if_none_match.strip() == '*':
+            return True
+        etag = validators.etag.removeprefix('W/')
+        return any(tag.strip().removeprefix('W/') == etag for tag in if_none_match.split(','))
+
+    if_modified_since = request.headers.get('if-modified-since')
+    if not if_modified_since or not use_last_modified or validators.last_modified is None:
+        return False
+    try:
+        since = _as_utc(parsedate_to_datetime(if_modified_since))
+    except (TypeError, ValueError):
+        return False
+    return validators.last_modified.replace(microsecond=0) <= since
+
+
+def not_modified_response(validators: Validators) -> Response:
+    """Ответ 304 без тела с валидаторами текущего представления."""
+    return Response(status_code=304, headers=validators.headers)
+
+
+async def item_validators(dao: BaseDAO, session: AsyncSession, obj_id: int) -> Validators | None:
+    """Валидаторы записи по времени ее изменения, без загрузки записи.
+
+    Returns:
+        Validators | None: валидаторы или None, если запись не найдена
+
+    """
+    updated_at = await dao.get_updated_at_by_id(session=session, obj_id=obj_id)
+    if updated_at is None:
+        return None
+    return record_validators(dao, obj_id, updated_at)
+
+
+def record_validators(dao: BaseDAO, obj_id: int, updated_at: datetime) -> Validators:
+    """Валидаторы записи с известным временем изменения (например, уже загруженной)."""
+    return Validators(make_etag(dao.model.__tablename__, obj_id, updated_at.isoformat()), updated_at)
+
+
+def page_validators(
+    dao: BaseDAO,
+    rows: Sequence[Mapping[str, Any]],
+    next_cursor: str | None,
+    request: Request,
+) -> Validators:
+    """Валидаторы страницы списка по ключам и времени изменения ее записей.
+
+    ETag зависит от параметров запроса (фильтр, курсор, поля, сортировка), id и времени
+    изменения записей страницы и курсора следующей страницы, поэтому изменение,
+    добавление или удаление записи меняет ETag только страниц, на которые она попадает.
+    Строки должны содержать поля PAGE_VALIDATOR_FIELDS.
+
+    If-Modified-Since для списков не учитывается (use_last_modified=False):
+    удаление записи не меняет время последнего изменения страницы.
+    """
+    keys = [(row['id'], row['updated_at'].isoformat()) for row in rows]
+    query = sorted(request.query_params.multi_items())
+    etag = make_etag(dao.model.__tablename__, keys, next_cursor, query)
+    return Validators(etag, max((row['updated_at'] for row in rows), default=None))
@@ -1,4 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, status
+from fastapi.responses import PlainTextResponse
+
+from core.db import db_manager
+from core.metrics import metrics
 
 router = APIRouter()
 
@@ -7,3 +11,27 @@ router = APIRouter()
 async def main_page() -> dict:
     """Обработка обращения к главной странице."""
     return {'status': 'OK'}
+
+
+@router.get('/health/live')
+async def health_live() -> dict:
+    """Проверка работы процесса приложения (liveness), без обращения к БД."""
+    return {'status': 'OK'}
+
+
+@router.get('/health/ready')
+async def health_ready(response: Response) -> dict:
+    """Готовность к обработке запросов (readiness): доступность БД и состояние пулов.
+
+    Если основной сервер БД недоступен, возвращается 503.
+    """
+    ready, databases = await db_manager.readiness()
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {'status': 'OK' if ready else 'unavailable', 'databases': databases}
+
+
+@router.get('/metrics', response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """Метрики приложения в текстовом формате Prometheus."""
+    return PlainTextResponse(metrics.render(), media_type='text/plain; version=0.0.4')
@@ -1,36 +1,141 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import Response
+from typing import Annotated
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.db import get_session_with_commit
+from api.conditional import (
+    PAGE_VALIDATOR_FIELDS,
+    has_conditions,
+    is_not_modified,
+    item_validators,
+    not_modified_response,
+    page_validators,
+    record_validators,
+)
+from api.export import export_response
+from api.imports import import_records
+from core.config import settings
+from core.db import db_manager, get_client_key, get_session_read_only, get_session_with_commit
+from core.serializers import get_serializer
 from dao.user_dao import user_dao
-from schemas.user import UserCreate, UserDB, UserUpdate
+from schemas.bulk import BulkResult, ImportResult
+from schemas.export import ImportFormat
+from schemas.pagination import TOTAL_COUNT_HEADER, Page
+from schemas.user import (
+    UserBulkUpdate,
+    UserCreate,
+    UserDB,
+    UserExportParams,
+    UserListParams,
+    UserSearchParams,
+    UserUpdate,
+)
 
 router = APIRouter()
 
 
 @router.get(
     '/',
-    response_model=list[UserDB],
+    response_model=Page[UserDB],
 )
 async def get_all_users(
-    session: AsyncSession = Depends(get_session_with_commit),
-    name: str | None = None,
-    full_name: str | None = None,
-) -> list[UserDB]:
-    """Получение списка пользователей."""
-    filter_params = {}
-    if name:
-        filter_params['name'] = name
-    if full_name:
-        filter_params['full_name'] = full_name
-
-    user_list = await user_dao.find_all(
-        session=session,
-        filter_params=filter_params,
+    params: Annotated[UserListParams, Query()],
+    request: Request,
+    session: AsyncSession = Depends(get_session_read_only),
+) -> Response:
+    """Получение страницы списка пользователей.
+
+    Для получения следующей страницы нужно передать `cursor` из ответа.
+    Параметр `fields` ограничивает поля записей в ответе, из БД читаются только они
+    (и поля для ETag). Общее количество записей возвращается в заголовке X-Total-Count,
+    если оно запрошено параметром `count` (или задан COUNT_MODE_DEFAULT для первой страницы);
+    для больших выборок в режимах 'estimated' и 'auto' это оценка.
+
+    Ответ содержит ETag страницы по id и времени изменения ее записей. На условный
+    запрос (If-None-Match) сначала читаются только эти поля записей страницы; если
+    страница не изменилась с копии клиента, возвращается 304 без чтения записей.
+    """
+    fields = params.field_names()
+    filter_params = params.filter_params()
+    page_params = {
+        'session': session,
+        'filter_params': filter_params,
+        'cursor': params.cursor,
+        'limit': params.limit,
+        'order_by': params.order_by,
+    }
+    try:
+        if has_conditions(request):
+            keys, next_cursor = await user_dao.find_page(**page_params, fields=PAGE_VALIDATOR_FIELDS)
+            validators = page_validators(user_dao, keys, next_cursor, request)
+            if is_not_modified(request, validators, use_last_modified=False):
+                return not_modified_response(validators)
+        rows, next_cursor = await user_dao.find_page(**page_params, fields=(*fields, *PAGE_VALIDATOR_FIELDS))
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+    headers = page_validators(user_dao, rows, next_cursor, request).headers
+    count_mode = params.count or (settings.count_mode_default if params.cursor is None else None)
+    if count_mode is not None:
+        total = await user_dao.count(session=session, filter_params=filter_params, mode=count_mode)
+        headers[TOTAL_COUNT_HEADER] = str(total or 0)
+
+    # Строки сериализуются напрямую в JSON, без ORM объектов и проверки через UserDB
+    serializer = get_serializer(user_dao.model.__table__, fields)
+    return Response(
+        content=serializer.dumps_page(rows, next_cursor),
+        media_type='application/json',
+        headers=headers,
     )
 
-    return user_list or []
+
+@router.get(
+    '/search',
+    response_model=Page[UserDB],
+)
+async def search_users(
+    params: Annotated[UserSearchParams, Query()],
+    session: AsyncSession = Depends(get_session_read_only),
+) -> Response:
+    """Нечеткий поиск пользователей по имени и полному имени.
+
+    Записи отсортированы по убыванию сходства со строкой поиска.
+    Для получения следующей страницы нужно передать `cursor` из ответа.
+    """
+    fields = params.field_names()
+    try:
+        rows, next_cursor = await user_dao.search(
+            session=session,
+            query=params.q,
+            filter_params=params.filter_params(),
+            cursor=params.cursor,
+            limit=params.limit,
+            fields=fields,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+
+    serializer = get_serializer(user_dao.model.__table__, fields)
+    return Response(content=serializer.dumps_page(rows, next_cursor), media_type='application/json')
+
+
+@router.get(
+    '/export',
+    response_class=StreamingResponse,
+)
+async def export_users(
+    request: Request,
+    params: Annotated[UserExportParams, Query()],
+) -> StreamingResponse:
+    """Потоковая выгрузка пользователей в NDJSON или CSV."""
+    return export_response(
+        dao=user_dao,
+        filter_params=params.filter_params(),
+        export_format=params.export_format,
+        fields=params.field_names(),
+        client_key=get_client_key(request),
+    )
 
 
 @router.post(
@@ -41,8 +146,107 @@ async def create_user(
     new_user: UserCreate,
     session: AsyncSession = Depends(get_session_with_commit),
 ) -> UserDB:
-    """Создание пользователя."""
-    return await user_dao.create(session=session, new_object=new_user)
+    """Создание пользователя.
+
+    При включенном объединении записей (settings.db_write_batch_enabled) одновременные
+    запросы создают пользователей одним INSERT и одним COMMIT.
+    """
+    return await user_dao.create(session=session, new_object=new_user, batched=True)
+
+
+@router.post(
+    '/bulk',
+    response_model=BulkResult[UserDB],
+)
+async def bulk_create_users(
+    new_users: list[UserCreate] = Body(..., max_length=settings.bulk_max_items),
+    session: AsyncSession = Depends(get_session_with_commit),
+) -> BulkResult[UserDB]:
+    """Пакетное создание пользователей."""
+    users, errors = await user_dao.bulk_create(session=session, new_objects=new_users)
+    return BulkResult.from_dao(users, errors)
+
+
+@router.patch(
+    '/bulk',
+    response_model=BulkResult[UserDB],
+)
+async def bulk_update_users(
+    users_update: list[UserBulkUpdate] = Body(..., max_length=settings.bulk_max_items),
+    session: AsyncSession = Depends(get_session_with_commit),
+) -> BulkResult[UserDB]:
+    """Пакетное обновление пользователей."""
+    users, errors = await user_dao.bulk_update(session=session, update_objects=users_update)
+    return BulkResult.from_dao(users, errors)
+
+
+@router.delete(
+    '/bulk',
+    response_model=BulkResult[int],
+)
+async def bulk_delete_users(
+    user_ids: list[int] = Body(..., max_length=settings.bulk_max_items),
+    session: AsyncSession = Depends(get_session_with_commit),
+) -> BulkResult[int]:
+    """Пакетное удаление пользователей."""
+    deleted_ids, errors = await user_dao.bulk_delete(session=session, obj_ids=user_ids)
+    return BulkResult.from_dao(deleted_ids, errors)
+
+
+@router.post(
+    '/import',
+    response_model=ImportResult,
+)
+async def import_users(
+    request: Request,
+    import_format: Annotated[ImportFormat, Query(alias='format')] = 'ndjson',
+) -> ImportResult:
+    """Потоковая загрузка пользователей из NDJSON или CSV.
+
+    Тело запроса - данные пользователей как при создании: NDJSON (объект на строку)
+    или CSV с заголовком из имен полей. Тело читается по частям и загружается порциями,
+    в PostgreSQL - командой COPY. Некорректные записи и записи, нарушающие ограничения БД,
+    пропускаются и возвращаются в errors; если их больше settings.import_max_errors,
+    загрузка отменяется целиком.
+    """
+    try:
+        result = await import_records(user_dao, request.stream(), import_format, UserCreate)
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    if result.imported > 0:
+        db_manager.mark_write(get_client_key(request))
+    return result
+
+
+@router.get(
+    '/{user_id}',
+    response_model=UserDB,
+)
+async def get_user(
+    user_id: int,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_session_read_only),
+) -> UserDB | Response:
+    """Получение пользователя.
+
+    Ответ содержит ETag и Last-Modified по времени изменения записи. На условный
+    запрос (If-None-Match, If-Modified-Since) без изменений возвращается 304,
+    запись при этом не читается.
+    """
+    if has_conditions(request):
+        validators = await item_validators(user_dao, session, user_id)
+        if validators is None:
+            raise HTTPException(status_code=404, detail='Пользователь не найден.')
+        if is_not_modified(request, validators):
+            return not_modified_response(validators)
+
+    user = await user_dao.get_one_or_none_by_id(session=session, obj_id=user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail='Пользователь не найден.')
+
+    response.headers.update(record_validators(user_dao, user_id, user.updated_at).headers)
+    return user
 
 
 @router.patch(
@@ -55,15 +259,11 @@ async def update_user(
     session: AsyncSession = Depends(get_session_with_commit),
 ) -> UserDB:
     """Обновляем пользователя."""
-    user = await user_dao.get_one_or_none_by_id(session=session, obj_id=user_id)
+    user = await user_dao.update_by_id(session=session, obj_id=user_id, update_data=user_update)
     if user is None:
         raise HTTPException(status_code=404, detail='Пользователь не найден.')
 
-    return await user_dao.update(
-        session=session,
-        update_object=user,
-        update_data=user_update,
-    )
+    return user
 
 
 @router.delete(
@@ -75,9 +275,7 @@ async def delete_user(
     session: AsyncSession = Depends(get_session_with_commit),
 ) -> Response:
     """Удаляем пользователя из БД."""
-    user = await user_dao.get_one_or_none_by_id(session=session, obj_id=user_id)
-    if user is None:
+    if not await user_dao.delete_by_id(session=session, obj_id=user_id):
         raise HTTPException(status_code=404, detail='Пользователь не найден.')
 
-    await user_dao.delete(session=session, delete_object=user)
     return Response(status_code=204)
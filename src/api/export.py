@@ -0,0 +1,97 @@
+import csv
+import io
+from typing import Any, AsyncIterator, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import RowMapping
+
+from core.db import db_manager
+from core.serializers import RowSerializer, get_serializer
+from dao.base_dao import BaseDAO
+from schemas.export import ExportFormat
+
+MEDIA_TYPES: dict[str, str] = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+async def _dao_chunks(
+    dao: BaseDAO,
+    filter_params: dict[str, Any],
+    fields: Sequence[str] | None,
+    client_key: str | None,
+) -> AsyncIterator[Sequence[RowMapping]]:
+    """Чтение записей DAO порциями в собственной сессии только для чтения (на реплике).
+
+    Сессия открывается внутри генератора, так как тело потокового ответа формируется
+    уже после завершения зависимостей FastAPI.
+    """
+    async with db_manager.session_read_only(client_key=client_key, stream=True) as session:
+        async for chunk in dao.stream_all(session=session, filter_params=filter_params, fields=fields):
+            yield chunk
+
+
+async def _ndjson_stream(
+    chunks: AsyncIterator[Sequence[RowMapping]],
+    serializer: RowSerializer,
+) -> AsyncIterator[bytes]:
+    """Формирование NDJSON: одна запись на строку."""
+    async for chunk in chunks:
+        yield b''.join(serializer.dumps_row(row) + b'\n' for row in chunk)
+
+
+async def _csv_stream(
+    chunks: AsyncIterator[Sequence[RowMapping]],
+    columns: list[str],
+) -> AsyncIterator[bytes]:
+    """Формирование CSV с заголовком из имен колонок."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for chunk in chunks:
+        writer.writerows([row[column] for column in columns] for row in chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_response(
+    dao: BaseDAO,
+    filter_params: dict[str, Any],
+    export_format: ExportFormat,
+    fields: Sequence[str] | None = None,
+    client_key: str | None = None,
+) -> StreamingResponse:
+    """Потоковая выгрузка записей DAO в NDJSON или CSV.
+
+    В памяти одновременно находится не больше одной порции записей,
+    размер порции задается settings.stream_chunk_size.
+
+    Args:
+        dao (BaseDAO): DAO, записи которого выгружаются
+        filter_params (dict[str, Any]): параметры для поиска
+        export_format (ExportFormat): формат выгрузки: 'ndjson' или 'csv'
+        fields (Sequence[str] | None): выгружаемые колонки, по умолчанию все
+        client_key (str | None): идентификатор клиента для чтения своих записей
+
+    Returns:
+        StreamingResponse: потоковый ответ
+
+    """
+    table = dao.model.__table__
+    fields = tuple(fields) if fields else tuple(table.columns.keys())
+    chunks = _dao_chunks(dao, filter_params, fields, client_key)
+    if export_format == 'csv':
+        body = _csv_stream(chunks, list(fields))
+    else:
+        body = _ndjson_stream(chunks, get_serializer(table, fields))
+
+    filename = f'{dao.model.__tablename__}.{export_format}'
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
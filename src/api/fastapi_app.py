@@ -1,31 +1,21 @@
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
-from fastapi import FastAPI, Request, Response
+from fastapi import FastAPI
 from loguru import logger
-from starlette.middleware.base import (
-    BaseHTTPMiddleware,
-    RequestResponseEndpoint,
-)
 
 from api.endpoints import main_router, router_v1
+from api.middleware import (
+    ProxyHeadersMiddleware,
+    QueryLogMiddleware,
+    RequestIdMiddleware,
+    TimingMiddleware,
+)
 from core.config import settings
 from core.db import db_manager
-
-
-class FixProtocolMiddleware(BaseHTTPMiddleware):
-    """Обработка запроса."""
-
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: RequestResponseEndpoint,
-    ) -> Response:
-        """Проверка и коррекция протокола запроса."""
-        protocol = request.headers.get('X-Forwarded-Protocol', None)
-        if protocol in ('http', 'https'):
-            request.scope['scheme'] = protocol
-        return await call_next(request)
+from core.partitioning import PartitionMaintenance
+from core.slow_queries import SlowQueryLog
+from models import Base
 
 
 @asynccontextmanager
@@ -37,8 +27,37 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     """
     logger.info('Инициализация соединения с БД')
-    db_manager.init(db_url=settings.database_url)
+    db_manager.init(
+        db_url=settings.database_url,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        connection_mode=settings.db_connection_mode,
+        statement_cache_size=settings.db_statement_cache_size,
+        prepared_statement_cache_size=settings.db_prepared_statement_cache_size,
+        replica_urls=settings.database_replica_urls,
+        replica_strategy=settings.db_replica_strategy,
+        replica_retry_interval=settings.db_replica_retry_interval,
+        read_your_writes_window=settings.db_read_your_writes_window,
+        metrics_enabled=settings.metrics_enabled,
+        slow_query_log=SlowQueryLog(
+            threshold=settings.slow_query_threshold,
+            explain=settings.slow_query_explain,
+            repeat_threshold=settings.query_repeat_threshold,
+        )
+        if settings.slow_query_log_enabled
+        else None,
+        pool_pre_ping=settings.db_health_check_interval <= 0,
+    )
+    await db_manager.warm_up(settings.db_pool_warmup)
+    if settings.db_health_check_interval > 0:
+        db_manager.start_health_checks(settings.db_health_check_interval)
+    partition_maintenance = PartitionMaintenance(Base.metadata)
+    if settings.db_partition_maintenance_interval > 0 and partition_maintenance.tables:
+        partition_maintenance.start(settings.db_partition_maintenance_interval)
     yield
+    await partition_maintenance.stop()
     logger.info('Закрытие соединения с БД')
     await db_manager.close()
 
@@ -58,7 +77,14 @@ def get_fastapi_app() -> FastAPI:
         version=settings.app_version,
     )
 
-    app.add_middleware(FixProtocolMiddleware)
+    # Middleware на уровне ASGI: не буферизуют ответ и не создают задачу на запрос,
+    # последний добавленный выполняется первым
+    if settings.slow_query_log_enabled:
+        app.add_middleware(QueryLogMiddleware)
+    if settings.metrics_enabled:
+        app.add_middleware(TimingMiddleware)
+    app.add_middleware(RequestIdMiddleware)
+    app.add_middleware(ProxyHeadersMiddleware, trusted_hosts=settings.proxy_trusted_hosts)
 
     # TODO: Добавить обработчики запросов
     app.include_router(main_router)
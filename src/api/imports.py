@@ -0,0 +1,196 @@
+import codecs
+import csv
+import json
+import time
+from typing import Any, AsyncIterator, Type
+
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+
+from core.config import settings
+from dao.base_dao import BaseDAO
+from schemas.bulk import BulkItemError, ImportResult
+from schemas.export import ImportFormat
+
+
+async def _lines(body: AsyncIterator[bytes]) -> AsyncIterator[list[str]]:
+    """Строки тела запроса (с переводом строки в конце) по мере получения.
+
+    Каждая часть тела дает порцию строк; незавершенная строка в конце части
+    переносится в следующую порцию.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    tail = ''
+    try:
+        async for data in body:
+            lines = (tail + decoder.decode(data)).split('\n')
+            tail = lines.pop()
+            if lines:
+                yield [line + '\n' for line in lines]
+        tail += decoder.decode(b'', final=True)
+    except UnicodeDecodeError as error:
+        raise ValueError(f'Тело запроса не в кодировке UTF-8: {error}')
+    if tail:
+        yield [tail]
+
+
+async def _ndjson_rows(lines: AsyncIterator[list[str]]) -> AsyncIterator[Any]:
+    """Записи NDJSON: значение каждой непустой строки или ошибка, если строка - не JSON."""
+    async for chunk in lines:
+        for line in chunk:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                yield error
+
+
+async def _csv_rows(lines: AsyncIterator[list[str]]) -> AsyncIterator[dict[str, str] | ValueError]:
+    """Записи CSV с заголовком из имен полей: словарь по записи или ошибка.
+
+    csv.reader получает только целые записи: строка, в которой не закрыта кавычка,
+    объединяется со следующими (значение с переводом строки).
+    """
+    header: list[str] | None = None
+    pending: list[str] = []
+    quotes = 0
+    async for chunk in lines:
+        complete: list[str] = []
+        for line in chunk:
+            pending.append(line)
+            quotes += line.count('"')
+            if quotes % 2 == 0:
+                complete.extend(pending)
+                pending, quotes = [], 0
+        try:
+            for values in csv.reader(complete):
+                if not values:
+                    continue
+                if header is None:
+                    header = values
+                elif len(values) != len(header):
+                    yield ValueError(f'Ожидалось полей: {len(header)}, получено: {len(values)}')
+                else:
+                    yield dict(zip(header, values))
+        except csv.Error as error:
+            raise ValueError(f'Некорректный CSV: {error}')
+    if pending:
+        yield ValueError('Не закрыта кавычка в конце загрузки')
+
+
+def _error_detail(error: ValueError) -> str:
+    """Текст ошибки записи для отчета о загрузке."""
+    if isinstance(error, ValidationError):
+        return '; '.join(
+            f'{".".join(str(part) for part in item["loc"]) or "запись"}: {item["msg"]}'
+            for item in error.errors()
+        )
+    return str(error)
+
+
+async def _records(
+    rows: AsyncIterator[Any],
+    schema: Type[BaseModel],
+    columns: tuple[str, ...],
+    invalid: dict[int, str],
+    failed: dict[int, str],
+) -> AsyncIterator[tuple[Any, ...]]:
+    """Значения колонок записей, прошедших проверку схемой; ошибки остальных - в invalid.
+
+    Допустимое число ошибочных записей общее с ошибками БД (failed), которые
+    BaseDAO.copy_from записывает по мере загрузки.
+    """
+    index = 0
+    async for row in rows:
+        try:
+            if isinstance(row, ValueError):
+                raise row
+            item = schema.model_validate(row)
+        except ValueError as error:
+            invalid[index] = _error_detail(error)
+            if len(invalid) + len(failed) > settings.import_max_errors:
+                raise ValueError(f'Загрузка отменена: больше {settings.import_max_errors} ошибочных записей')
+        else:
+            yield tuple(getattr(item, column) for column in columns)
+        index += 1
+
+
+def _source_index(index: int, skipped: list[int]) -> int:
+    """Номер записи в загрузке по ее номеру среди переданных в DAO.
+
+    Args:
+        index (int): номер записи среди переданных в DAO
+        skipped (list[int]): номера пропущенных записей загрузки по возрастанию
+
+    """
+    for skipped_index in skipped:
+        if skipped_index > index:
+            break
+        index += 1
+    return index
+
+
+async def import_records(
+    dao: BaseDAO,
+    body: AsyncIterator[bytes],
+    import_format: ImportFormat,
+    schema: Type[BaseModel],
+) -> ImportResult:
+    """Потоковая загрузка записей DAO из NDJSON или CSV (см. BaseDAO.copy_from).
+
+    Тело читается по частям и загружается порциями по settings.import_chunk_size записей,
+    вся загрузка в памяти не хранится. Каждая запись проверяется схемой; загружаются
+    поля схемы. CSV должен начинаться с заголовка из имен полей, лишние поля игнорируются.
+
+    Записи, не прошедшие проверку или ограничения БД, пропускаются и попадают в ошибки
+    с номером записи в загрузке (с 0, без заголовка CSV). Если таких записей (обоих видов
+    вместе) больше settings.import_max_errors, загрузка отменяется целиком.
+
+    Args:
+        dao (BaseDAO): DAO, в таблицу которого загружаются записи
+        body (AsyncIterator[bytes]): тело запроса
+        import_format (ImportFormat): формат загрузки: 'ndjson' или 'csv'
+        schema (Type[BaseModel]): схема записи
+
+    Returns:
+        ImportResult: количество загруженных и пропущенных записей, ошибки и скорость загрузки
+
+    Raises:
+        ValueError: некорректное тело запроса или слишком много ошибочных записей
+
+    """
+    columns = tuple(schema.model_fields)
+    lines = _lines(body)
+    rows = _csv_rows(lines) if import_format == 'csv' else _ndjson_rows(lines)
+    invalid: dict[int, str] = {}
+    failed: dict[int, str] = {}
+
+    started = time.perf_counter()
+    imported, _ = await dao.copy_from(
+        _records(rows, schema, columns, invalid, failed),
+        columns,
+        max_errors=settings.import_max_errors,
+        errors=failed,
+        rejected=invalid,
+    )
+    elapsed = time.perf_counter() - started
+
+    skipped = list(invalid)
+    errors = invalid | {_source_index(index, skipped): detail for index, detail in failed.items()}
+    rows_per_second = imported / elapsed if elapsed else 0.0
+    logger.info(
+        'Загружено {imported} записей {model} за {elapsed:.2f} с ({speed:.0f}/с), пропущено: {rejected}',
+        model=dao.model.__name__,
+        imported=imported,
+        elapsed=elapsed,
+        speed=rows_per_second,
+        rejected=len(errors),
+    )
+    return ImportResult(
+        imported=imported,
+        rejected=len(errors),
+        errors=[BulkItemError(index=index, detail=detail) for index, detail in sorted(errors.items())],
+        elapsed=round(elapsed, 3),
+        rows_per_second=round(rows_per_second, 1),
+    )
@@ -0,0 +1,11 @@
+from api.middleware.proxy import ProxyHeadersMiddleware
+from api.middleware.query_log import QueryLogMiddleware
+from api.middleware.request_id import RequestIdMiddleware
+from api.middleware.timing import TimingMiddleware
+
+__all__ = [
+    'ProxyHeadersMiddleware',
+    'QueryLogMiddleware',
+    'RequestIdMiddleware',
+    'TimingMiddleware',
+]
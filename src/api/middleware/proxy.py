@@ -0,0 +1,54 @@
+from typing import Sequence
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Заголовки протокола запроса, установленные прокси
+PROTOCOL_HEADERS = ('x-forwarded-protocol', 'x-forwarded-proto')
+FORWARDED_FOR_HEADER = 'x-forwarded-for'
+
+
+class ProxyHeadersMiddleware:
+    """Протокол и адрес клиента из заголовков прокси (ASGI middleware).
+
+    Заголовки учитываются только для запросов от доверенных прокси, по умолчанию - только
+    с 127.0.0.1. '*' в trusted_hosts означает доверие любому адресу: задается явно и только
+    если приложение доступно лишь через прокси, иначе клиент может подменить свой адрес.
+    """
+
+    def __init__(self, app: ASGIApp, trusted_hosts: Sequence[str] = ('127.0.0.1',)) -> None:  # noqa: D107
+        self.app = app
+        self.trust_all = '*' in trusted_hosts
+        self.trusted_hosts = frozenset(trusted_hosts)
+
+    def _client_host(self, forwarded_for: str) -> str | None:
+        """Адрес клиента из X-Forwarded-For: первый адрес справа, не являющийся прокси."""
+        hosts = [host.strip() for host in forwarded_for.split(',') if host.strip()]
+        if not hosts:
+            return None
+        if self.trust_all:
+            return hosts[0]
+        for host in reversed(hosts):
+            if host not in self.trusted_hosts:
+                return host
+        return hosts[0]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Обработка запроса."""
+        if scope['type'] in ('http', 'websocket'):
+            client = scope.get('client')
+            if self.trust_all or (client and client[0] in self.trusted_hosts):
+                headers = Headers(scope=scope)
+                for name in PROTOCOL_HEADERS:
+                    protocol = headers.get(name, '').lower()
+                    if protocol in ('http', 'https'):
+                        if scope['type'] == 'websocket':
+                            protocol = 'wss' if protocol == 'https' else 'ws'
+                        scope['scheme'] = protocol
+                        break
+                forwarded_for = headers.get(FORWARDED_FOR_HEADER)
+                if forwarded_for:
+                    host = self._client_host(forwarded_for)
+                    if host:
+                        scope['client'] = (host, 0)
+        await self.app(scope, receive, send)
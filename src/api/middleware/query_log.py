@@ -0,0 +1,22 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from core.slow_queries import RequestQueries, request_queries
+
+
+class QueryLogMiddleware:
+    """Область HTTP запроса для подсчета повторяющихся запросов к БД (ASGI middleware)."""
+
+    def __init__(self, app: ASGIApp) -> None:  # noqa: D107
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Обработка запроса с отдельными счетчиками запросов к БД."""
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        token = request_queries.set(RequestQueries(f'{scope["method"]} {scope["path"]}'))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_queries.reset(token)
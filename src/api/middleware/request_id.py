@@ -0,0 +1,39 @@
+import uuid
+
+from loguru import logger
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.logs import REQUEST_ID_HEADER
+
+# Максимальная длина идентификатора запроса, принимаемого от клиента
+REQUEST_ID_MAX_LENGTH = 128
+
+
+class RequestIdMiddleware:
+    """Идентификатор запроса и контекст логирования (ASGI middleware).
+
+    Идентификатор берется из заголовка X-Request-Id или создается и возвращается
+    в ответе в том же заголовке. request_id и route добавляются в extra всех записей
+    лога, сделанных при обработке запроса, включая передачу тела потокового ответа.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:  # noqa: D107
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Обработка запроса."""
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get(REQUEST_ID_HEADER, '')[:REQUEST_ID_MAX_LENGTH]
+        request_id = request_id or uuid.uuid4().hex
+
+        async def send_with_request_id(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        with logger.contextualize(request_id=request_id, route=f'{scope["method"]} {scope["path"]}'):
+            await self.app(scope, receive, send_with_request_id)
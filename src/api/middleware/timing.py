@@ -0,0 +1,48 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.metrics import RequestStats, metrics, request_stats
+
+
+class TimingMiddleware:
+    """Учет времени обработки запроса и времени запросов к БД (ASGI middleware).
+
+    Заголовок Server-Timing содержит время до начала ответа, в метрики
+    (core.metrics) попадает полное время, включая передачу тела ответа.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:  # noqa: D107
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Обработка запроса."""
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                duration = time.perf_counter() - start
+                MutableHeaders(scope=message)['Server-Timing'] = (
+                    f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries", '
+                    f'total;dur={duration * 1000:.1f}'
+                )
+            await send(message)
+
+        token = request_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_stats.reset(token)
+            route = scope.get('route')
+            metrics.observe_request(
+                scope['method'],
+                route.path if route else 'unmatched',
+                time.perf_counter() - start,
+                stats,
+            )
@@ -1,11 +1,12 @@
-import uuid
+import functools
 from datetime import datetime
-from decimal import Decimal
 
 from sqlalchemy import TIMESTAMP, Integer, MetaData, func, inspect
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, mapped_column
 
+from core.serializers import converter_for
+
 convention = {
     'all_column_names': lambda constraint, table: '_'.join(
         [column.name for column in constraint.columns.values()],
@@ -25,6 +26,10 @@ class Base(AsyncAttrs, DeclarativeBase):
 
     metadata = MetaData(naming_convention=convention)
 
+    # Значения, вычисляемые на стороне БД (created_at, updated_at), читаются
+    # через RETURNING при flush, без отдельного SELECT
+    __mapper_args__ = {'eager_defaults': True}
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
@@ -48,23 +53,26 @@ class Base(AsyncAttrs, DeclarativeBase):
 
         """
         result = {}
-        for column in inspect(self.__class__).columns:
-            value = getattr(self, column.key)
+        for key in self._column_keys():
+            value = getattr(self, key)
 
             # Преобразование специальных типов данных
-            if isinstance(value, datetime):
-                value = value.isoformat()
-            elif isinstance(value, Decimal):
-                value = float(value)
-            elif isinstance(value, uuid.UUID):
-                value = str(value)
+            converter = converter_for(type(value))
+            if converter is not None:
+                value = converter(value)
 
             # Добавляем значение в результат
             if not exclude_none or value is not None:
-                result[column.key] = value
+                result[key] = value
 
         return result
 
+    @classmethod
+    @functools.cache
+    def _column_keys(cls) -> tuple[str, ...]:
+        """Имена колонок модели, вычисляются один раз для класса."""
+        return tuple(column.key for column in inspect(cls).columns)
+
     def __repr__(self) -> str:
         """Строковое представление объекта для отладки."""
         return (
@@ -1,57 +1,439 @@
+import asyncio
 import contextlib
-from typing import AsyncIterator, Optional
+import time
+import uuid
+from typing import Any, AsyncIterator, Literal, Optional, Sequence
 
+from fastapi import Request
 from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.exc import InvalidRequestError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
     AsyncEngine,
     AsyncSession,
+    AsyncSessionTransaction,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+from core.logs import log_debug
+from core.metrics import InstrumentedPool, instrument_engine, metrics
+from core.slow_queries import SlowQueryLog
+
+
+class ReadOnlySession(Session):
+    """Сессия только для чтения."""
+
+
+@event.listens_for(ReadOnlySession, 'before_flush')
+def _forbid_flush(session: Session, flush_context: UOWTransaction, instances: object) -> None:
+    """Запрет записи изменений объектов в сессии только для чтения."""
+    raise InvalidRequestError('Сессия только для чтения не может изменять данные')
+
+
+@event.listens_for(ReadOnlySession, 'do_orm_execute')
+def _forbid_dml(orm_execute_state: ORMExecuteState) -> None:
+    """Запрет INSERT/UPDATE/DELETE запросов в сессии только для чтения."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        raise InvalidRequestError('Сессия только для чтения не может изменять данные')
+
+
+# Заголовок, по которому определяется клиент для чтения своих записей с основного сервера
+CLIENT_ID_HEADER = 'X-Client-Id'
+
+# Максимальное число клиентов, для которых хранится время последней записи
+RECENT_WRITES_MAX = 100_000
+
+# Ключ session.info: клиент сессии записал данные (отмечается методами записи DAO,
+# в том числе когда запись выполнена отдельно, например пакетом WriteBatcher)
+WROTE_KEY = 'wrote'
+
+# Время ожидания проверки соединения с БД, сек.
+HEALTH_CHECK_TIMEOUT = 5.0
+
+
+def _read_only_sessionmaker(engine: AsyncEngine, autocommit: bool = True) -> async_sessionmaker[AsyncSession]:
+    """Фабрика сессий только для чтения.
+
+    Чтение выполняется в режиме автокоммита: без BEGIN/COMMIT на каждый запрос.
+    Без автокоммита (autocommit=False) сессия читает в транзакции: она нужна
+    курсорам на стороне сервера (потоковое чтение).
+    """
+    return async_sessionmaker(
+        bind=engine.execution_options(isolation_level='AUTOCOMMIT') if autocommit else engine,
+        expire_on_commit=False,
+        sync_session_class=ReadOnlySession,
+    )
+
+
+class Replica:
+    """Реплика БД, используемая для чтения.
+
+    Ошибка подключения к реплике или разрыв соединения исключают ее из чтения
+    на retry_interval секунд.
+    """
+
+    def __init__(self, engine: AsyncEngine, retry_interval: float = 30.0) -> None:  # noqa: D107
+        self.engine = engine
+        self.sessionmaker = _read_only_sessionmaker(engine)
+        self.stream_sessionmaker = _read_only_sessionmaker(engine, autocommit=False)
+        self.retry_interval = retry_interval
+        self.unhealthy_until = 0.0
+        event.listen(engine.sync_engine, 'handle_error', self._on_error)
+
+    def _on_error(self, context: ExceptionContext) -> None:
+        """Исключение реплики из чтения, если к ней не удалось подключиться."""
+        if context.is_pre_ping or not (context.connection is None or context.is_disconnect):
+            return
+        self.unhealthy_until = time.monotonic() + self.retry_interval
+        logger.warning(
+            'Реплика {url!r} недоступна, читаем с других серверов: {error}',
+            url=self.engine.url,
+            error=context.original_exception,
+        )
+
+    @property
+    def healthy(self) -> bool:
+        """Доступна ли реплика для чтения."""
+        return time.monotonic() >= self.unhealthy_until
+
+    @property
+    def connections_in_use(self) -> int:
+        """Количество соединений реплики, выданных из пула."""
+        checkedout = getattr(self.engine.pool, 'checkedout', None)
+        return checkedout() if checkedout else 0
+
+
+class EngineHealth:
+    """Доступность сервера БД по результату последней проверки."""
+
+    __slots__ = ('checked_at', 'error', 'healthy')
+
+    def __init__(self, error: Exception | None = None) -> None:  # noqa: D107
+        self.healthy = error is None
+        self.error = type(error).__name__ if error is not None else None
+        self.checked_at = time.time()
 
 
 class DatabaseSessionManager:
-    """Управление сессиями и соединениями с БД."""
+    """Управление сессиями и соединениями с БД.
+
+    Запись и транзакционное чтение выполняются на основном сервере. Сессии только
+    для чтения распределяются между репликами (по очереди или на реплику с наименьшим
+    числом занятых соединений). Недоступная реплика исключается на replica_retry_interval
+    секунд, при отсутствии доступных реплик чтение выполняется на основном сервере.
+    """
 
     def __init__(self) -> None:  # noqa: D107
         self._engine: Optional[AsyncEngine] = None
         self._sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+        self._read_only_sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+        self._stream_sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+        self._replicas: list[Replica] = []
+        self._replica_strategy = 'round_robin'
+        self._replica_retry_interval = 30.0
+        self._replica_counter = 0
+        self._read_your_writes_window = 0.0
+        self._recent_writes: dict[str, float] = {}
+        self._health: dict[str, EngineHealth] = {}
+        self._health_task: asyncio.Task | None = None
 
-    def init(self, db_url: str) -> None:
+    def init(
+        self,
+        db_url: str,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = -1,
+        connection_mode: Literal['direct', 'pgbouncer'] = 'direct',
+        statement_cache_size: int = 100,
+        prepared_statement_cache_size: int = 100,
+        replica_urls: Sequence[str] = (),
+        replica_strategy: Literal['round_robin', 'least_connections'] = 'round_robin',
+        replica_retry_interval: float = 30.0,
+        read_your_writes_window: float = 0.0,
+        metrics_enabled: bool = False,
+        slow_query_log: SlowQueryLog | None = None,
+        pool_pre_ping: bool = True,
+    ) -> None:
         """Инициализация соединения с БД.
 
         Args:
             db_url (str): URL соединения с БД.
+            pool_size (int): Количество постоянных соединений в пуле.
+            max_overflow (int): Количество дополнительных соединений сверх pool_size.
+            pool_timeout (float): Время ожидания свободного соединения, сек.
+            pool_recycle (int): Время жизни соединения, сек. (-1 - без ограничения).
+            connection_mode (str): 'direct' - прямое соединение с Postgres,
+                'pgbouncer' - соединение через PgBouncer в режиме transaction pooling.
+            statement_cache_size (int): Размер кэша подготовленных выражений asyncpg.
+            prepared_statement_cache_size (int): Размер кэша подготовленных выражений SQLAlchemy.
+            replica_urls (Sequence[str]): URL реплик для чтения, у каждой свой пул соединений.
+            replica_strategy (str): Выбор реплики: 'round_robin' или 'least_connections'.
+            replica_retry_interval (float): На сколько секунд исключается недоступная реплика.
+            read_your_writes_window (float): Сколько секунд после записи клиент читает
+                с основного сервера (0 - не учитывать записи клиента).
+            metrics_enabled (bool): Сбор метрик запросов и пулов соединений (core.metrics).
+            slow_query_log (SlowQueryLog | None): Журнал медленных и повторяющихся запросов.
+            pool_pre_ping (bool): Проверка соединения при каждом получении из пула.
+                Отключается, если соединения проверяются в фоне (start_health_checks).
 
         """
+        engine_options: dict[str, Any] = {}
+        connect_args: dict[str, Any] = {}
         if 'postgresql' in db_url:
-            connect_args = {
-                'statement_cache_size': 0,
-                'prepared_statement_cache_size': 0,
+            if connection_mode == 'pgbouncer':
+                # PgBouncer в режиме transaction pooling не сохраняет подготовленные выражения
+                # между транзакциями, поэтому кэш отключается, а имена выражений делаются
+                # уникальными, чтобы не пересекаться на общих серверных соединениях
+                connect_args = {
+                    'statement_cache_size': 0,
+                    'prepared_statement_cache_size': 0,
+                    'prepared_statement_name_func': lambda: f'__asyncpg_{uuid.uuid4()}__',
+                }
+            else:
+                connect_args = {
+                    'statement_cache_size': statement_cache_size,
+                    'prepared_statement_cache_size': prepared_statement_cache_size,
+                }
+        if 'sqlite' not in db_url:
+            engine_options = {
+                'pool_size': pool_size,
+                'max_overflow': max_overflow,
+                'pool_timeout': pool_timeout,
+                'pool_recycle': pool_recycle,
             }
-        else:
-            connect_args = {}
-        self._engine = create_async_engine(
-            url=db_url,
-            pool_pre_ping=True,
-            connect_args=connect_args,
-        )
+            if metrics_enabled:
+                engine_options['poolclass'] = InstrumentedPool
+
+        def create_engine(url: str, name: str) -> AsyncEngine:
+            """Создание движка; name - имя движка в метриках."""
+            options = dict(engine_options)
+            if 'poolclass' in options:
+                options['pool_logging_name'] = name
+            engine = create_async_engine(
+                url=url,
+                pool_pre_ping=pool_pre_ping,
+                connect_args=connect_args,
+                **options,
+            )
+            if metrics_enabled:
+                instrument_engine(name, engine)
+            if slow_query_log is not None:
+                slow_query_log.attach(engine)
+            return engine
+
+        self._engine = create_engine(db_url, 'primary')
         self._sessionmaker = async_sessionmaker(
             bind=self._engine,
             expire_on_commit=False,
         )
-        logger.info('DatabaseSessionManager инициализирован')
+        self._read_only_sessionmaker = _read_only_sessionmaker(self._engine)
+        self._stream_sessionmaker = _read_only_sessionmaker(self._engine, autocommit=False)
+        self._replicas = [
+            Replica(create_engine(replica_url, f'replica{number}'), replica_retry_interval)
+            for number, replica_url in enumerate(replica_urls)
+        ]
+        self._replica_strategy = replica_strategy
+        self._replica_retry_interval = replica_retry_interval
+        self._read_your_writes_window = read_your_writes_window
+        self._recent_writes = {}
+        self._health = {}
+        logger.info(
+            'DatabaseSessionManager инициализирован, реплик: {replicas}',
+            replicas=len(self._replicas),
+        )
 
     async def close(self) -> None:
         """Закрытие соединения с БД."""
         if self._engine is None:
             return
+        if self._health_task is not None:
+            self._health_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._health_task
+            self._health_task = None
         await self._engine.dispose()
+        for replica in self._replicas:
+            await replica.engine.dispose()
         self._engine = None
         self._sessionmaker = None
+        self._read_only_sessionmaker = None
+        self._stream_sessionmaker = None
+        self._replicas = []
+        self._health = {}
+        metrics.engines.clear()
         logger.info('DatabaseSessionManager закрыт')
 
+    def _named_engines(self) -> list[tuple[str, AsyncEngine, Replica | None]]:
+        """Движки с именами, как в метриках: основной сервер и реплики."""
+        if self._engine is None:
+            return []
+        return [
+            ('primary', self._engine, None),
+            *((f'replica{number}', replica.engine, replica) for number, replica in enumerate(self._replicas)),
+        ]
+
+    def _set_health(self, name: str, replica: Replica | None, error: Exception | None) -> None:
+        """Запись результата проверки сервера; недоступная реплика исключается из чтения."""
+        previous = self._health.get(name)
+        self._health[name] = EngineHealth(error)
+        if replica is not None:
+            replica.unhealthy_until = time.monotonic() + self._replica_retry_interval if error else 0.0
+        if error is not None:
+            logger.warning('Сервер БД {engine} недоступен: {error}', engine=name, error=error)
+        elif previous is not None and not previous.healthy:
+            logger.info('Сервер БД {engine} снова доступен', engine=name)
+
+    async def warm_up(self, connections: int) -> None:
+        """Открытие соединений заранее, чтобы первые запросы не ждали подключения к БД.
+
+        Args:
+            connections (int): сколько соединений открыть в каждом пуле (не больше размера пула)
+
+        """
+        for name, engine, replica in self._named_engines():
+            size = getattr(engine.pool, 'size', None)
+            count = min(connections, size()) if size else 0
+            if count <= 0:
+                continue
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(engine.connect().start() for _ in range(count)),
+                return_exceptions=True,
+            )
+            errors = [result for result in results if isinstance(result, Exception)]
+            for result in results:
+                if isinstance(result, AsyncConnection):
+                    await result.close()
+            self._set_health(name, replica, errors[0] if errors else None)
+            logger.info(
+                'Пул {engine}: открыто соединений {opened} из {count} за {duration:.3f} с',
+                engine=name,
+                opened=count - len(errors),
+                count=count,
+                duration=time.perf_counter() - start,
+            )
+
+    async def _ping(self, engine: AsyncEngine) -> None:
+        """Проверочный запрос на соединении из пула; неработающее соединение пул отбрасывает."""
+        async with asyncio.timeout(HEALTH_CHECK_TIMEOUT), engine.connect() as connection:
+            await connection.execution_options(isolation_level='AUTOCOMMIT')
+            await connection.exec_driver_sql('SELECT 1')
+
+    async def check_health(self) -> None:
+        """Проверка простаивающих соединений пулов и доступности серверов БД.
+
+        Каждое простаивающее соединение проверяется запросом, поэтому после перезапуска
+        сервера БД неработающие соединения отбрасываются до того, как их получат запросы.
+        Если все соединения пула заняты, проверка пула пропускается: сервер доступен.
+        """
+        for name, engine, replica in self._named_engines():
+            pool = engine.pool
+            idle = pool.checkedin() if hasattr(pool, 'checkedin') else 0
+            busy = pool.checkedout() if hasattr(pool, 'checkedout') else 0
+            if not idle and busy:
+                continue
+            error = None
+            for _ in range(max(idle, 1)):
+                try:
+                    await self._ping(engine)
+                except (OSError, SQLAlchemyError) as ping_error:
+                    error = ping_error
+            self._set_health(name, replica, error)
+
+    def start_health_checks(self, interval: float) -> None:
+        """Запуск фоновой проверки соединений раз в interval секунд (см. check_health)."""
+
+        async def run() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.check_health()
+                except Exception as error:
+                    logger.error('Ошибка проверки соединений с БД: {error}', error=error)
+
+        self._health_task = asyncio.create_task(run())
+
+    async def readiness(self) -> tuple[bool, dict[str, Any]]:
+        """Готовность к обработке запросов и состояние серверов БД и пулов соединений.
+
+        Готовность определяется доступностью основного сервера по последней проверке;
+        без фоновой проверки сервер проверяется при вызове. Недоступная реплика
+        готовность не снимает: чтение выполняется на основном сервере.
+
+        Returns:
+            tuple[bool, dict[str, Any]]: готовность и состояние по именам серверов
+
+        """
+        if self._engine is None:
+            return False, {}
+        if self._health_task is None or 'primary' not in self._health:
+            await self.check_health()
+        state: dict[str, Any] = {}
+        for name, engine, _ in self._named_engines():
+            health = self._health.get(name)
+            state[name] = {
+                'healthy': health.healthy if health else None,
+                'error': health.error if health else None,
+                'checked_at': health.checked_at if health else None,
+                'pool': {
+                    key: getattr(engine.pool, getter)()
+                    for key, getter in (('size', 'size'), ('idle', 'checkedin'), ('in_use', 'checkedout'))
+                    if hasattr(engine.pool, getter)
+                },
+            }
+        primary = self._health.get('primary')
+        return primary is None or primary.healthy, state
+
+    def mark_write(self, client_key: str | None) -> None:
+        """Отметка о записи клиента для чтения своих записей с основного сервера.
+
+        Args:
+            client_key (str | None): идентификатор клиента
+
+        """
+        if not client_key or not self._replicas or self._read_your_writes_window <= 0:
+            return
+        now = time.monotonic()
+        if len(self._recent_writes) >= RECENT_WRITES_MAX:
+            self._recent_writes = {key: until for key, until in self._recent_writes.items() if until > now}
+        self._recent_writes[client_key] = now + self._read_your_writes_window
+
+    def _is_sticky(self, client_key: str | None) -> bool:
+        """Должен ли клиент читать с основного сервера после своей записи."""
+        if not client_key:
+            return False
+        until = self._recent_writes.get(client_key)
+        return until is not None and until > time.monotonic()
+
+    def _choose_replica(self) -> Replica | None:
+        """Выбор доступной реплики для чтения."""
+        healthy = [replica for replica in self._replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self._replica_strategy == 'least_connections':
+            return min(healthy, key=lambda replica: replica.connections_in_use)
+        self._replica_counter += 1
+        return healthy[self._replica_counter % len(healthy)]
+
+    def _open_read_only_session(self, client_key: str | None, stream: bool = False) -> AsyncSession:
+        """Создание сессии только для чтения на реплике или на основном сервере.
+
+        Соединение сессия получает при первом запросе: сессии, чтения которых
+        объединены (dao.single_flight), соединение не занимают. Если к реплике
+        не удалось подключиться, запрос завершается ошибкой, а реплика исключается
+        из чтения (Replica); фоновые проверки (check_health) исключают недоступную
+        реплику раньше, чем на нее попадут запросы.
+        """
+        replica = None if self._is_sticky(client_key) else self._choose_replica()
+        if replica is not None:
+            return replica.stream_sessionmaker() if stream else replica.sessionmaker()
+        return self._stream_sessionmaker() if stream else self._read_only_sessionmaker()
+
     @contextlib.asynccontextmanager
     async def session_without_commit(self) -> AsyncIterator[AsyncSession]:
         """Получение сессии работы с БД без коммита."""
@@ -59,31 +441,68 @@ class DatabaseSessionManager:
             raise IOError('DatabaseSessionManager is not initialized')
         async with self._sessionmaker() as session:
             try:
-                logger.info(f'Сессия {id(session)} без коммита создана')
+                log_debug('Сессия {session_id} без коммита создана', session_id=id(session))
                 yield session
             except Exception:
                 await session.rollback()
                 raise
             finally:
                 await session.close()
-                logger.info(f'Сессия {id(session)} без коммита закрыта')
+                log_debug('Сессия {session_id} без коммита закрыта', session_id=id(session))
 
     @contextlib.asynccontextmanager
-    async def session_with_commit(self) -> AsyncIterator[AsyncSession]:
-        """Получение сессии работы с БД с коммитом."""
+    async def session_with_commit(self, client_key: str | None = None) -> AsyncIterator[AsyncSession]:
+        """Получение сессии работы с БД с коммитом.
+
+        Args:
+            client_key (str | None): идентификатор клиента для чтения своих записей
+
+        """
         if self._sessionmaker is None:
             raise IOError('DatabaseSessionManager is not initialized')
         async with self._sessionmaker() as session:
             try:
-                logger.info(f'Сессия {id(session)} c коммитом создана')
+                log_debug('Сессия {session_id} c коммитом создана', session_id=id(session))
                 yield session
+                wrote = session.info.get(WROTE_KEY, False)
                 await session.commit()
+                if wrote:
+                    self.mark_write(client_key)
             except Exception:
                 await session.rollback()
                 raise
             finally:
                 await session.close()
-                logger.info(f'Сессия {id(session)} с коммитом закрыта')
+                log_debug('Сессия {session_id} с коммитом закрыта', session_id=id(session))
+
+    @contextlib.asynccontextmanager
+    async def session_read_only(
+        self,
+        client_key: str | None = None,
+        stream: bool = False,
+    ) -> AsyncIterator[AsyncSession]:
+        """Получение сессии работы с БД только для чтения.
+
+        Каждый запрос выполняется в режиме автокоммита, поэтому сессия не тратит
+        обращения к БД на BEGIN/COMMIT и не удерживает транзакцию между запросами.
+        Изменение данных в такой сессии запрещено. Если заданы реплики, сессия
+        открывается на одной из них.
+
+        Args:
+            client_key (str | None): идентификатор клиента для чтения своих записей
+            stream (bool): сессия для потокового чтения: запросы выполняются в одной
+                транзакции, которая откатывается при закрытии сессии
+
+        """
+        if self._read_only_sessionmaker is None:
+            raise IOError('DatabaseSessionManager is not initialized')
+        session = self._open_read_only_session(client_key, stream=stream)
+        try:
+            log_debug('Сессия {session_id} только для чтения создана', session_id=id(session))
+            yield session
+        finally:
+            await session.close()
+            log_debug('Сессия {session_id} только для чтения закрыта', session_id=id(session))
 
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
@@ -92,31 +511,66 @@ class DatabaseSessionManager:
             raise IOError('DatabaseSessionManager is not initialized')
         async with self._engine.begin() as connection:
             try:
-                logger.info(f'Соединение {id(connection)} создано')
+                log_debug('Соединение {connection_id} создано', connection_id=id(connection))
                 yield connection
             except Exception:
                 await connection.rollback()
                 raise
             finally:
-                logger.info(f'Соединение {id(connection)} закрыто')
+                log_debug('Соединение {connection_id} закрыто', connection_id=id(connection))
 
 
 db_manager = DatabaseSessionManager()
 
 
+def mark_session_write(session: AsyncSession) -> None:
+    """Отметка о записи данных в сессии.
+
+    После коммита сессии with_commit клиент читает свои записи с основного сервера
+    (см. DatabaseSessionManager.mark_write). Чтение и запросы, ничего не изменившие,
+    не отмечаются.
+    """
+    session.info[WROTE_KEY] = True
+
+
+@contextlib.asynccontextmanager
+async def savepoint(session: AsyncSession) -> AsyncIterator[AsyncSessionTransaction]:
+    """Вложенная транзакция (SAVEPOINT) внутри транзакции сессии.
+
+    При исключении внутри блока откатываются только изменения, сделанные в блоке,
+    транзакция сессии продолжается и фиксируется на границе запроса.
+    """
+    async with session.begin_nested() as transaction:
+        yield transaction
+
+
 async def get_session_without_commit() -> AsyncIterator[AsyncSession]:
     """Получение сессии для зависимостей FastAPI без комита."""
     # This is Fastapi dependency
     # session: AsyncSession = Depends(get_session)
     async with db_manager.session_without_commit() as session:
-        logger.info(f'Сессия {id(session)} без комита получена')
+        log_debug('Сессия {session_id} без комита получена', session_id=id(session))
         yield session
 
 
-async def get_session_with_commit() -> AsyncIterator[AsyncSession]:
+def get_client_key(request: Request) -> str | None:
+    """Идентификатор клиента: заголовок X-Client-Id или адрес клиента."""
+    return request.headers.get(CLIENT_ID_HEADER) or (request.client.host if request.client else None)
+
+
+async def get_session_with_commit(request: Request) -> AsyncIterator[AsyncSession]:
     """Получение сессии для зависимостей FastAPI с комитом."""
     # This is Fastapi dependency
     # session: AsyncSession = Depends(get_session)
-    async with db_manager.session_with_commit() as session:
-        logger.info(f'Сессия {id(session)} с комитом получена')
+    async with db_manager.session_with_commit(client_key=get_client_key(request)) as session:
+        log_debug('Сессия {session_id} с комитом получена', session_id=id(session))
+        yield session
+
+
+async def get_session_read_only(request: Request) -> AsyncIterator[AsyncSession]:
+    """Получение сессии только для чтения для зависимостей FastAPI."""
+    # This is Fastapi dependency
+    # session: AsyncSession = Depends(get_session_read_only)
+    async with db_manager.session_read_only(client_key=get_client_key(request)) as session:
+        log_debug('Сессия {session_id} только для чтения получена', session_id=id(session))
         yield session
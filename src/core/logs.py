@@ -0,0 +1,60 @@
+import json
+import random
+import traceback
+from typing import Any
+
+from loguru import logger
+
+from core.config import settings
+
+# Заголовок с идентификатором запроса: принимается от клиента или создается приложением
+REQUEST_ID_HEADER = 'X-Request-Id'
+
+# Значения контекста запроса в записях вне HTTP запроса
+DEFAULT_CONTEXT = {'request_id': '-', 'route': '-'}
+
+# Логгер для отладочных событий: вызывающая функция указывается в записи вместо log_debug
+_debug_logger = logger.opt(depth=1)
+
+
+def log_debug(message: str, **kwargs: Any) -> None:
+    """Отладочное событие горячего пути (обращения к DAO, открытие сессий).
+
+    Сообщение форматируется только если уровень DEBUG включен хотя бы в одном sink,
+    поэтому значения передаются именованными аргументами, а не f-строкой:
+    log_debug('Ищем запись {model} с id={obj_id}', model=..., obj_id=...).
+    Аргументы также попадают в extra записи (поля JSON лога).
+
+    При settings.log_debug_sample_rate < 1 записывается только эта доля событий.
+    """
+    rate = settings.log_debug_sample_rate
+    if rate < 1.0 and random.random() >= rate:
+        return
+    _debug_logger.debug(message, **kwargs)
+
+
+def _json_default(value: Any) -> str:
+    return str(value)
+
+
+def json_format(record: dict) -> str:
+    """Формат записи для JSON sink: один JSON объект на строку.
+
+    Используется как format в logger.add: loguru подставляет подготовленную строку
+    из extra, поэтому фигурные скобки в JSON не воспринимаются как поля формата.
+    """
+    extra = {key: value for key, value in record['extra'].items() if key != 'json'}
+    payload = {
+        'time': record['time'].isoformat(),
+        'level': record['level'].name,
+        'message': record['message'],
+        'module': record['module'],
+        'function': record['function'],
+        'line': record['line'],
+        **extra,
+    }
+    if record['exception'] is not None:
+        error_type, error, error_traceback = record['exception']
+        payload['exception'] = ''.join(traceback.format_exception(error_type, error, error_traceback))
+    record['extra']['json'] = json.dumps(payload, ensure_ascii=False, default=_json_default)
+    return '{extra[json]}\n'
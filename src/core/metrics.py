@@ -0,0 +1,306 @@
+import bisect
+import functools
+import re
+import time
+from contextvars import ContextVar
+from typing import Any, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+# Границы корзин гистограмм длительности, сек.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Максимальное число различных запросов в метриках, остальные учитываются как 'other'
+MAX_STATEMENTS = 1000
+STATEMENT_LABEL_LENGTH = 200
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\$\d+|%\(\w+\)s|\b\d+(?:\.\d+)?\b")
+_PARAM_LISTS = re.compile(r'\?(?:::\w+)?(?:\s*,\s*\?(?:::\w+)?)+')
+_WHITESPACE = re.compile(r'\s+')
+# Нумерованные имена (sa_savepoint_1, anon_2): номер заменяется, имя остается
+_NUMBERED_NAMES = re.compile(r'\b([A-Za-z_]\w*?)_\d+\b')
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_statement(statement: str) -> str:
+    """Нормализованный текст запроса для метрик.
+
+    Параметры и литералы заменяются на '?', списки параметров (IN (...)) сворачиваются,
+    номера в именах точек сохранения и других нумерованных идентификаторах заменяются
+    на '?', поэтому запросы, отличающиеся только значениями, учитываются вместе.
+    """
+    statement = _NUMBERED_NAMES.sub(r'\1_?', statement)
+    statement = _LITERALS.sub('?', statement)
+    statement = _PARAM_LISTS.sub('?, ...', statement)
+    return _WHITESPACE.sub(' ', statement).strip()[:STATEMENT_LABEL_LENGTH]
+
+
+class Histogram:
+    """Гистограмма значений с фиксированными корзинами (как Prometheus histogram)."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:  # noqa: D107
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Учет значения."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestStats:
+    """Статистика обращений к БД в рамках одного HTTP запроса."""
+
+    __slots__ = ('db_time', 'queries')
+
+    def __init__(self) -> None:  # noqa: D107
+        self.db_time = 0.0
+        self.queries = 0
+
+
+class FlightStats:
+    """Статистика объединения одинаковых чтений (dao.single_flight) для одной операции."""
+
+    __slots__ = ('executed', 'max_waiters', 'shared', 'waiters')
+
+    def __init__(self) -> None:  # noqa: D107
+        self.executed = 0
+        self.shared = 0
+        self.waiters = 0
+        self.max_waiters = 0
+
+
+# Статистика текущего запроса: контекст копируется в задачи и greenlet SQLAlchemy,
+# поэтому обработчики событий движка видят объект, созданный в middleware
+request_stats: ContextVar[RequestStats | None] = ContextVar('request_stats', default=None)
+
+
+class MetricsRegistry:
+    """Метрики приложения и соединений с БД в памяти процесса.
+
+    Каждый процесс (worker) ведет собственные метрики.
+    """
+
+    def __init__(self) -> None:  # noqa: D107
+        self.engines: dict[str, AsyncEngine] = {}
+        self.statements: dict[str, Histogram] = {}
+        self.pool_wait: dict[str, Histogram] = {}
+        self.requests: dict[tuple[str, str], Histogram] = {}
+        self.request_db_time: dict[tuple[str, str], Histogram] = {}
+        self.request_queries: dict[tuple[str, str], int] = {}
+        self.flights: dict[str, FlightStats] = {}
+        self.caches: dict[str, Any] = {}
+
+    def observe_statement(self, statement: str, duration: float) -> None:
+        """Учет длительности выполнения запроса к БД."""
+        key = normalize_statement(statement)
+        histogram = self.statements.get(key)
+        if histogram is None:
+            if len(self.statements) >= MAX_STATEMENTS:
+                key = 'other'
+                histogram = self.statements.get(key)
+            if histogram is None:
+                histogram = self.statements[key] = Histogram()
+        histogram.observe(duration)
+        stats = request_stats.get()
+        if stats is not None:
+            stats.db_time += duration
+            stats.queries += 1
+
+    def observe_pool_wait(self, engine_name: str, duration: float) -> None:
+        """Учет времени получения соединения из пула."""
+        histogram = self.pool_wait.get(engine_name)
+        if histogram is None:
+            histogram = self.pool_wait[engine_name] = Histogram()
+        histogram.observe(duration)
+
+    def observe_request(self, method: str, route: str, duration: float, stats: RequestStats) -> None:
+        """Учет длительности HTTP запроса и его обращений к БД."""
+        key = (method, route)
+        if key not in self.requests:
+            self.requests[key] = Histogram()
+            self.request_db_time[key] = Histogram()
+            self.request_queries[key] = 0
+        self.requests[key].observe(duration)
+        self.request_db_time[key].observe(stats.db_time)
+        self.request_queries[key] += stats.queries
+
+    def flight(self, operation: str) -> FlightStats:
+        """Статистика объединения чтений операции, например 'User.find_page'."""
+        stats = self.flights.get(operation)
+        if stats is None:
+            stats = self.flights[operation] = FlightStats()
+        return stats
+
+    def register_cache(self, table_name: str, cache: Any) -> None:
+        """Учет кэша записей таблицы (dao.cache.EntityCache) в метриках."""
+        self.caches[table_name] = cache
+
+    def render(self) -> str:
+        """Метрики в текстовом формате Prometheus."""
+        lines: list[str] = []
+        _render_histograms(
+            lines,
+            'db_statement_duration_seconds',
+            'Длительность выполнения запросов к БД',
+            (({'statement': key}, histogram) for key, histogram in self.statements.items()),
+        )
+        _render_histograms(
+            lines,
+            'db_pool_checkout_duration_seconds',
+            'Время получения соединения из пула',
+            (({'engine': name}, histogram) for name, histogram in self.pool_wait.items()),
+        )
+        for name, help_text, getter in (
+            ('db_pool_size', 'Размер пула соединений', 'size'),
+            ('db_pool_checked_out', 'Соединения, выданные из пула', 'checkedout'),
+            ('db_pool_overflow', 'Соединения сверх размера пула', 'overflow'),
+        ):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            for engine_name, engine in self.engines.items():
+                value = getattr(engine.pool, getter, None)
+                if value is not None:
+                    # overflow() отрицателен, пока пул не заполнен: соединений сверх размера нет
+                    lines.append(f'{name}{_labels({"engine": engine_name})} {max(0, value())}')
+        _render_histograms(
+            lines,
+            'http_request_duration_seconds',
+            'Длительность обработки HTTP запросов',
+            (
+                ({'method': method, 'route': route}, histogram)
+                for (method, route), histogram in self.requests.items()
+            ),
+        )
+        _render_histograms(
+            lines,
+            'http_request_db_duration_seconds',
+            'Время запросов к БД за HTTP запрос',
+            (
+                ({'method': method, 'route': route}, histogram)
+                for (method, route), histogram in self.request_db_time.items()
+            ),
+        )
+        lines.append('# HELP http_request_db_queries_total Количество запросов к БД из HTTP запросов')
+        lines.append('# TYPE http_request_db_queries_total counter')
+        for (method, route), value in self.request_queries.items():
+            labels = _labels({'method': method, 'route': route})
+            lines.append(f'http_request_db_queries_total{labels} {value}')
+        self._render_dao(lines)
+        return '\n'.join(lines) + '\n'
+
+    def _render_dao(self, lines: list[str]) -> None:
+        """Метрики DAO: объединение чтений и кэш записей."""
+        lines.append('# HELP dao_single_flight_calls_total Вызовы чтений DAO: выполненные и объединенные')
+        lines.append('# TYPE dao_single_flight_calls_total counter')
+        for operation, stats in self.flights.items():
+            for result, value in (('executed', stats.executed), ('shared', stats.shared)):
+                labels = _labels({'operation': operation, 'result': result})
+                lines.append(f'dao_single_flight_calls_total{labels} {value}')
+        for name, help_text, getter in (
+            ('dao_single_flight_waiters', 'Вызовы, ожидающие выполняющихся чтений', 'waiters'),
+            ('dao_single_flight_waiters_max', 'Наибольшее число вызовов одного чтения', 'max_waiters'),
+        ):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} gauge')
+            for operation, stats in self.flights.items():
+                lines.append(f'{name}{_labels({"operation": operation})} {getattr(stats, getter)}')
+        lines.append('# HELP dao_cache_requests_total Обращения к кэшу записей: попадания и промахи')
+        lines.append('# TYPE dao_cache_requests_total counter')
+        for table_name, cache in self.caches.items():
+            for result, value in cache.stats().items():
+                labels = _labels({'table': table_name, 'result': result})
+                lines.append(f'dao_cache_requests_total{labels} {value}')
+
+
+def _escape_label(value: str) -> str:
+    """Экранирование значения метки в формате Prometheus."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels: dict[str, str]) -> str:
+    """Метки метрики в формате Prometheus."""
+    return '{' + ','.join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + '}'
+
+
+def _render_histograms(
+    lines: list[str],
+    name: str,
+    help_text: str,
+    histograms: Iterable[tuple[dict[str, str], Histogram]],
+) -> None:
+    """Гистограммы в текстовом формате Prometheus."""
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} histogram')
+    for labels, histogram in histograms:
+        cumulative = 0
+        for bound, count in zip((*histogram.buckets, float('inf')), histogram.counts, strict=True):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{name}_bucket{_labels({**labels, "le": le})} {cumulative}')
+        lines.append(f'{name}_sum{_labels(labels)} {histogram.sum}')
+        lines.append(f'{name}_count{_labels(labels)} {histogram.count}')
+
+
+metrics = MetricsRegistry()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Пул соединений, учитывающий время получения соединения.
+
+    Время включает ожидание свободного соединения, открытие нового и его проверку
+    (pool_pre_ping). Имя движка в метриках задается параметром pool_logging_name движка.
+    Переопределяется только публичный метод Pool.connect: событие пула checkout
+    вызывается уже после получения соединения и не позволяет измерить ожидание.
+    """
+
+    def connect(self) -> PoolProxiedConnection:
+        """Получение соединения из пула с учетом времени получения."""
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            metrics.observe_pool_wait(self.logging_name or 'primary', time.perf_counter() - start)
+
+
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    context._metrics_start = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    start = getattr(context, '_metrics_start', None)
+    if start is not None:
+        metrics.observe_statement(statement, time.perf_counter() - start)
+
+
+def instrument_engine(engine_name: str, engine: AsyncEngine) -> None:
+    """Подключение сбора метрик запросов и пула соединений движка.
+
+    Args:
+        engine_name (str): имя движка в метках метрик, например 'primary'
+        engine (AsyncEngine): движок SQLAlchemy
+
+    """
+    event.listen(engine.sync_engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine.sync_engine, 'after_cursor_execute', _after_cursor_execute)
+    metrics.engines[engine_name] = engine
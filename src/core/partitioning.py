@@ -0,0 +1,294 @@
+import asyncio
+import contextlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Literal
+
+from loguru import logger
+from sqlalchemy import TIMESTAMP, MetaData, PrimaryKeyConstraint, Table, func, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.db import db_manager
+from core.logs import log_debug
+
+# Интервал секционирования: одна секция на день, неделю (с понедельника), месяц или год
+PartitionInterval = Literal['day', 'week', 'month', 'year']
+
+# Что делать с секциями старше срока хранения: отсоединить (остается отдельной таблицей) или удалить
+ExpiredAction = Literal['detach', 'drop']
+
+# Ключ Table.info с параметрами секционирования (аргументы PartitionSpec)
+PARTITIONING_KEY = 'partitioning'
+
+# Ключ рекомендательной блокировки: обслуживание выполняет один процесс из нескольких
+MAINTENANCE_LOCK_KEY = 0x70617274
+
+LOCK_QUERY = text('SELECT pg_try_advisory_xact_lock(:key)')
+
+# Секции, присоединенные к таблице
+PARTITIONS_QUERY = text(
+    'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+    'WHERE i.inhparent = CAST(:table_name AS regclass)',
+)
+
+
+class PartitionSpec:
+    """Параметры секционирования таблицы по диапазонам времени.
+
+    Границы секций - время UTC без часового пояса, как значения колонок TIMESTAMP.
+    """
+
+    __slots__ = ('column', 'interval', 'premake', 'retention', 'expired')
+
+    def __init__(  # noqa: D107
+        self,
+        column: str = 'created_at',
+        interval: PartitionInterval = 'month',
+        premake: int = 3,
+        retention: int | None = None,
+        expired: ExpiredAction = 'detach',
+    ) -> None:
+        self.column = column
+        self.interval = interval
+        self.premake = premake
+        self.retention = retention
+        self.expired = expired
+
+    def start(self, moment: datetime) -> datetime:
+        """Начало интервала, в который попадает moment."""
+        if self.interval == 'day':
+            return datetime(moment.year, moment.month, moment.day)
+        if self.interval == 'week':
+            return datetime(moment.year, moment.month, moment.day) - timedelta(days=moment.weekday())
+        if self.interval == 'month':
+            return datetime(moment.year, moment.month, 1)
+        return datetime(moment.year, 1, 1)
+
+    def shift(self, start: datetime, count: int) -> datetime:
+        """Начало интервала, отстоящего от интервала start на count интервалов."""
+        if self.interval == 'day':
+            return start + timedelta(days=count)
+        if self.interval == 'week':
+            return start + timedelta(weeks=count)
+        if self.interval == 'month':
+            month = start.year * 12 + start.month - 1 + count
+            return datetime(month // 12, month % 12 + 1, 1)
+        return datetime(start.year + count, 1, 1)
+
+    def upcoming(self, now: datetime) -> list[tuple[datetime, datetime]]:
+        """Границы текущей секции и premake следующих."""
+        current = self.start(now)
+        return [(self.shift(current, n), self.shift(current, n + 1)) for n in range(self.premake + 1)]
+
+    def is_expired(self, start: datetime, now: datetime) -> bool:
+        """Истек ли срок хранения секции, начинающейся в start (retention интервалов)."""
+        if self.retention is None:
+            return False
+        return self.shift(start, 1) <= self.shift(self.start(now), -self.retention)
+
+
+def utc_now() -> datetime:
+    """Текущее время UTC без часового пояса."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def partition_name(table_name: str, start: datetime) -> str:
+    """Имя секции таблицы, начинающейся в start: '<таблица>_p<ГГГГММДД>'."""
+    return f'{table_name}_p{start:%Y%m%d}'
+
+
+def default_partition_name(table_name: str) -> str:
+    """Имя секции по умолчанию: строки, не попавшие ни в одну секцию."""
+    return f'{table_name}_default'
+
+
+def partition_start(table_name: str, name: str) -> datetime | None:
+    """Начало секции по ее имени или None, если имя - не имя секции таблицы."""
+    prefix = f'{table_name}_p'
+    if not name.startswith(prefix):
+        return None
+    try:
+        return datetime.strptime(name.removeprefix(prefix), '%Y%m%d')
+    except ValueError:
+        return None
+
+
+def is_partition_of(table_name: str, name: str) -> bool:
+    """Является ли таблица name секцией (в том числе отсоединенной) таблицы table_name."""
+    return name == default_partition_name(table_name) or partition_start(table_name, name) is not None
+
+
+def create_partition_sql(table_name: str, start: datetime, end: datetime) -> str:
+    """CREATE TABLE секции [start, end), если ее еще нет."""
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(table_name, start)}" PARTITION OF "{table_name}" '
+        f"FOR VALUES FROM ('{start:%Y-%m-%d %H:%M:%S}') TO ('{end:%Y-%m-%d %H:%M:%S}')"
+    )
+
+
+def create_default_partition_sql(table_name: str) -> str:
+    """CREATE TABLE секции по умолчанию, если ее еще нет."""
+    name = default_partition_name(table_name)
+    return f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table_name}" DEFAULT'
+
+
+def partition_spec(table: Table) -> PartitionSpec | None:
+    """Параметры секционирования таблицы или None, если таблица не секционируется."""
+    options = table.info.get(PARTITIONING_KEY)
+    return PartitionSpec(**options) if options is not None else None
+
+
+def partitioned_tables(metadata: MetaData) -> list[Table]:
+    """Секционируемые таблицы метаданных."""
+    return [table for table in metadata.sorted_tables if partition_spec(table) is not None]
+
+
+def _partitioned_table_args(table_args: Any, spec: PartitionSpec) -> tuple:
+    """__table_args__ модели с параметрами секционирования."""
+    if table_args is None:
+        args, kwargs = (), {}
+    elif isinstance(table_args, dict):
+        args, kwargs = (), dict(table_args)
+    elif table_args and isinstance(table_args[-1], dict):
+        args, kwargs = tuple(table_args[:-1]), dict(table_args[-1])
+    else:
+        args, kwargs = tuple(table_args), {}
+    # Ключ (id, <колонка>): индекс первичного ключа используется и для поиска по id
+    args = (*args, PrimaryKeyConstraint('id', spec.column))
+    kwargs['postgresql_partition_by'] = f'RANGE ({spec.column})'
+    # В info - словарь, а не PartitionSpec: info таблицы попадает в текст миграций
+    options = {name: getattr(spec, name) for name in PartitionSpec.__slots__}
+    kwargs['info'] = {**kwargs.get('info', {}), PARTITIONING_KEY: options}
+    return (*args, kwargs)
+
+
+class TimePartitioned:
+    """Миксин модели: таблица секционируется по диапазонам created_at (PostgreSQL).
+
+    Использование: class Event(TimePartitioned, Base). Параметры задаются атрибутами
+    класса: __partition_interval__ (интервал секции), __partition_premake__ (сколько
+    секций создавать заранее), __partition_retention__ (срок хранения в интервалах,
+    None - бессрочно) и __partition_expired__ (отсоединять или удалять старые секции).
+
+    Первичный ключ таблицы - (id, created_at): ключ секционированной таблицы должен
+    включать колонку секционирования. Для ORM идентификатором записи остается id.
+    Секции создаются миграцией (op.create_partitions) и фоновым обслуживанием
+    (PartitionMaintenance); запросы с условием по created_at читают только нужные секции.
+    """
+
+    __partition_interval__: PartitionInterval = 'month'
+    __partition_premake__: int = 3
+    __partition_retention__: int | None = None
+    __partition_expired__: ExpiredAction = 'detach'
+
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP, primary_key=True, server_default=func.now())
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:  # noqa: D105
+        if not cls.__dict__.get('__abstract__', False):
+            spec = PartitionSpec(
+                interval=cls.__partition_interval__,
+                premake=cls.__partition_premake__,
+                retention=cls.__partition_retention__,
+                expired=cls.__partition_expired__,
+            )
+            cls.__table_args__ = _partitioned_table_args(cls.__dict__.get('__table_args__'), spec)
+            cls.__mapper_args__ = {**getattr(cls, '__mapper_args__', {}), 'primary_key': ['id']}
+        super().__init_subclass__(**kwargs)
+
+
+async def _execute_ddl(connection: AsyncConnection, statement: str) -> bool:
+    """Выполнение DDL в точке сохранения: ошибка не прерывает обслуживание остальных секций."""
+    try:
+        async with connection.begin_nested():
+            await connection.execute(text(statement))
+    except SQLAlchemyError as error:
+        logger.error('Ошибка обслуживания секций: {statement}: {error}', statement=statement, error=error)
+        return False
+    return True
+
+
+async def maintain_partitions(
+    connection: AsyncConnection,
+    tables: list[Table],
+    now: datetime | None = None,
+) -> None:
+    """Обслуживание секций: создание будущих секций и отсоединение (удаление) истекших.
+
+    Выполняется под рекомендательной блокировкой транзакции: если обслуживание уже
+    выполняет другой процесс, ничего не делается.
+
+    Args:
+        connection (AsyncConnection): соединение с открытой транзакцией
+        tables (list[Table]): секционируемые таблицы
+        now (datetime | None): текущее время UTC, по умолчанию utc_now()
+
+    """
+    if connection.dialect.name != 'postgresql':
+        return
+    locked = await connection.scalar(LOCK_QUERY, {'key': MAINTENANCE_LOCK_KEY})
+    if not locked:
+        log_debug('Обслуживание секций выполняет другой процесс')
+        return
+    now = now or utc_now()
+    for table in tables:
+        spec = partition_spec(table)
+        created = 0
+        for start, end in spec.upcoming(now):
+            created += await _execute_ddl(connection, create_partition_sql(table.name, start, end))
+
+        expired = 0
+        names = (await connection.execute(PARTITIONS_QUERY, {'table_name': table.name})).scalars().all()
+        for name in sorted(names):
+            start = partition_start(table.name, name)
+            if start is None or not spec.is_expired(start, now):
+                continue
+            if spec.expired == 'drop':
+                statement = f'DROP TABLE "{name}"'
+            else:
+                statement = f'ALTER TABLE "{table.name}" DETACH PARTITION "{name}"'
+            expired += await _execute_ddl(connection, statement)
+
+        logger.info(
+            'Секции {table}: проверено будущих {created}, истекших обработано {expired} ({action})',
+            table=table.name,
+            created=created,
+            expired=expired,
+            action=spec.expired,
+        )
+
+
+class PartitionMaintenance:
+    """Периодическое обслуживание секций в фоне (см. maintain_partitions)."""
+
+    def __init__(self, metadata: MetaData) -> None:  # noqa: D107
+        self.tables = partitioned_tables(metadata)
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> None:
+        """Обслуживание секций всех секционируемых таблиц в отдельной транзакции."""
+        if not self.tables:
+            return
+        async with db_manager.connect() as connection:
+            await maintain_partitions(connection, self.tables)
+
+    def start(self, interval: float) -> None:
+        """Запуск обслуживания сразу и затем раз в interval секунд."""
+
+        async def run() -> None:
+            while True:
+                try:
+                    await self.run_once()
+                except Exception as error:
+                    logger.error('Ошибка обслуживания секций: {error}', error=error)
+                await asyncio.sleep(interval)
+
+        self._task = asyncio.create_task(run())
+
+    async def stop(self) -> None:
+        """Остановка фонового обслуживания."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
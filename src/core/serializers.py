@@ -0,0 +1,111 @@
+import functools
+import json
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+from sqlalchemy import Column, Table
+
+# Преобразование значений, которые не сериализуются в JSON напрямую
+CONVERTERS: dict[type, Callable[[Any], Any]] = {
+    datetime: datetime.isoformat,
+    date: date.isoformat,
+    time: time.isoformat,
+    Decimal: float,
+    uuid.UUID: str,
+}
+
+
+@functools.cache
+def converter_for(value_type: type) -> Callable[[Any], Any] | None:
+    """Преобразование значений типа или None, если не требуется.
+
+    Как и isinstance, учитывает подклассы (например, UUID драйвера asyncpg): берется
+    преобразование ближайшего типа из MRO. Результат кэшируется для каждого типа.
+    """
+    for base in value_type.__mro__:
+        converter = CONVERTERS.get(base)
+        if converter is not None:
+            return converter
+    return None
+
+
+def json_default(value: Any) -> Any:
+    """Преобразование типов, которые не сериализуются в JSON напрямую."""
+    converter = converter_for(type(value))
+    if converter is None:
+        raise TypeError(f'Тип {type(value).__name__} не сериализуется в JSON')
+    return converter(value)
+
+
+def _column_converter(column: Column) -> Callable[[Any], Any] | None:
+    """Преобразование значения колонки по ее типу или None, если не требуется."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return None
+    return converter_for(python_type)
+
+
+class RowSerializer:
+    """Сериализатор строк выборки (Core Row/RowMapping) в JSON.
+
+    Набор колонок и преобразования значений определяются один раз при создании,
+    поэтому на каждую строку приходится только сборка словаря, без проверок типов
+    и без промежуточных ORM объектов и pydantic моделей.
+    """
+
+    def __init__(self, columns: Sequence[Column]) -> None:
+        """Создание сериализатора.
+
+        Args:
+            columns (Sequence[Column]): сериализуемые колонки в порядке вывода
+
+        """
+        self.keys = tuple(column.key for column in columns)
+        self._converters = tuple(
+            (column.key, converter)
+            for column in columns
+            if (converter := _column_converter(column)) is not None
+        )
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=json_default)
+
+    def prepare(self, row: Mapping[str, Any]) -> dict[str, Any]:
+        """Словарь значений строки, готовых к сериализации в JSON."""
+        result = {key: row[key] for key in self.keys}
+        for key, converter in self._converters:
+            value = result[key]
+            if value is not None:
+                result[key] = converter(value)
+        return result
+
+    def dumps_row(self, row: Mapping[str, Any]) -> bytes:
+        """Сериализация одной строки в JSON."""
+        return self._encoder.encode(self.prepare(row)).encode()
+
+    def dumps(self, rows: Iterable[Mapping[str, Any]]) -> bytes:
+        """Сериализация списка строк в JSON."""
+        return self._encoder.encode([self.prepare(row) for row in rows]).encode()
+
+    def dumps_page(self, rows: Iterable[Mapping[str, Any]], next_cursor: str | None) -> bytes:
+        """Сериализация страницы списка в JSON в формате schemas.pagination.Page."""
+        return self._encoder.encode(
+            {'items': [self.prepare(row) for row in rows], 'next_cursor': next_cursor},
+        ).encode()
+
+
+@functools.lru_cache(maxsize=256)
+def get_serializer(table: Table, fields: tuple[str, ...] | None = None) -> RowSerializer:
+    """Сериализатор строк таблицы.
+
+    Args:
+        table (Table): таблица модели
+        fields (tuple[str, ...] | None): сериализуемые колонки, по умолчанию все
+
+    Returns:
+        RowSerializer: сериализатор, общий для всех вызовов с теми же аргументами
+
+    """
+    columns = [table.c[field] for field in fields] if fields else list(table.columns)
+    return RowSerializer(columns)
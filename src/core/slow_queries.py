@@ -0,0 +1,177 @@
+import json
+import time
+from contextvars import ContextVar
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.metrics import normalize_statement
+
+# Ключ в extra записей лога, по которому отчеты направляются в отдельный sink
+QUERY_REPORT_KEY = 'query_report'
+
+# Запросы, для которых план получается с ANALYZE: повторное выполнение не меняет данные
+ANALYZE_PREFIX = 'SELECT'
+
+
+class RequestQueries:
+    """Счетчики запросов к БД по форме запроса в рамках одного HTTP запроса."""
+
+    __slots__ = ('counts', 'request')
+
+    def __init__(self, request: str) -> None:  # noqa: D107
+        self.request = request
+        self.counts: dict[str, int] = {}
+
+
+request_queries: ContextVar[RequestQueries | None] = ContextVar('request_queries', default=None)
+
+
+def is_query_report(record: dict) -> bool:
+    """Является ли запись лога отчетом о запросах к БД (фильтр для sink)."""
+    return QUERY_REPORT_KEY in record['extra']
+
+
+def _redact_value(value: Any) -> Any:
+    """Тип значения параметра (и длина для строк и списков) вместо самого значения."""
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, (str, bytes, list, tuple)):
+        return f'{type(value).__name__}[{len(value)}]'
+    return type(value).__name__
+
+
+def redact(parameters: Any) -> Any:
+    """Параметры запроса без значений: позиционные, именованные или список наборов (executemany)."""
+    if isinstance(parameters, dict):
+        return {key: _redact_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            return [redact(item) for item in parameters]
+        return [_redact_value(value) for value in parameters]
+    return _redact_value(parameters)
+
+
+class SlowQueryLog:
+    """Журнал медленных запросов и повторяющихся запросов (N+1) к БД.
+
+    Подключается к движку через события SQLAlchemy. Отчеты пишутся в loguru
+    с ключом QUERY_REPORT_KEY в extra, для них настраивается отдельный sink
+    (см. main.loger_config).
+
+    Для подсчета повторов запросы группируются по форме (core.metrics.normalize_statement)
+    в пределах HTTP запроса, область запроса задает QueryLogMiddleware.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        explain: bool = False,
+        repeat_threshold: int = 10,
+    ) -> None:
+        """Создание журнала.
+
+        Args:
+            threshold (float): длительность запроса, после которой он считается медленным, сек.
+            explain (bool): добавлять в отчет план запроса (только Postgres). Для SELECT
+                план получается с ANALYZE, BUFFERS, то есть запрос выполняется повторно
+            repeat_threshold (int): предупреждать, если запрос одной формы выполнен
+                больше этого числа раз за HTTP запрос (0 - не проверять)
+
+        """
+        self.threshold = threshold
+        self.explain = explain
+        self.repeat_threshold = repeat_threshold
+
+    def attach(self, engine: AsyncEngine) -> None:
+        """Подключение журнала к движку."""
+        event.listen(engine.sync_engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine.sync_engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _before_cursor_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        context._slow_query_start = time.perf_counter()
+
+    def _after_cursor_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        start = getattr(context, '_slow_query_start', None)
+        if start is None:
+            return
+        duration = time.perf_counter() - start
+        queries = request_queries.get()
+        if queries is not None and self.repeat_threshold:
+            shape = normalize_statement(statement)
+            count = queries.counts.get(shape, 0) + 1
+            queries.counts[shape] = count
+            if count == self.repeat_threshold + 1:
+                logger.bind(**{QUERY_REPORT_KEY: 'repeated'}).warning(
+                    'Запрос выполнен больше {threshold} раз за {request} '
+                    '(возможна проблема N+1): {statement}',
+                    threshold=self.repeat_threshold,
+                    request=queries.request,
+                    statement=shape,
+                )
+        if duration < self.threshold:
+            return
+        plan = None
+        if self.explain and not executemany and conn.dialect.name == 'postgresql':
+            plan = self._explain(conn, statement, parameters)
+        # Нормализованный текст передается позиционно: он нужен только в сообщении,
+        # именованные значения попадают в поля отчета
+        logger.bind(
+            **{QUERY_REPORT_KEY: 'slow'},
+            request=queries.request if queries is not None else None,
+            parameters=redact(parameters),
+            plan=plan,
+        ).warning(
+            'Медленный запрос ({duration:.3f} с): {}',
+            normalize_statement(statement),
+            statement=statement,
+            duration=round(duration, 6),
+        )
+
+    def _explain(self, conn: Connection, statement: str, parameters: Any) -> Any:
+        """План выполнения запроса в формате JSON или None, если его не удалось получить.
+
+        План получается отдельным курсором того же соединения. Внутри транзакции
+        EXPLAIN выполняется в SAVEPOINT, чтобы ошибка не прервала транзакцию запроса.
+        """
+        analyze = statement.lstrip().upper().startswith(ANALYZE_PREFIX)
+        options = 'ANALYZE, BUFFERS, FORMAT JSON' if analyze else 'FORMAT JSON'
+        in_transaction = conn.get_execution_options().get('isolation_level') != 'AUTOCOMMIT'
+        cursor = conn.connection.cursor()
+        try:
+            if in_transaction:
+                cursor.execute('SAVEPOINT slow_query_explain')
+            try:
+                cursor.execute(f'EXPLAIN ({options}) {statement}', parameters)
+                plan = cursor.fetchone()[0]
+            except Exception:
+                if in_transaction:
+                    cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+                raise
+            if in_transaction:
+                cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+            return json.loads(plan) if isinstance(plan, str) else plan
+        except Exception as error:
+            logger.warning('Не удалось получить план медленного запроса: {error}', error=error)
+            return None
+        finally:
+            cursor.close()
@@ -0,0 +1,42 @@
+import os
+from pathlib import Path
+from typing import IO
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Файл блокировки, удерживаемый рабочим процессом на время работы
+_slot_lock: IO | None = None
+_slot: int | None = None
+
+
+def worker_slot(lock_dir: Path) -> int:
+    """Номер рабочего процесса: наименьший свободный номер, начиная с 0.
+
+    Номер закрепляется за процессом блокировкой файла lock_dir/worker{номер}.lock
+    и освобождается при завершении процесса (в том числе аварийном). Процесс,
+    запущенный вместо завершенного, получает освободившийся номер, поэтому номер
+    можно использовать в именах файлов: у каждого процесса свой лог.
+
+    Без fcntl (Windows) номером служит pid процесса.
+    """
+    global _slot, _slot_lock
+    if _slot is not None:
+        return _slot
+    if fcntl is None:
+        _slot = os.getpid()
+        return _slot
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    slot = 0
+    while True:
+        lock_file = open(lock_dir / f'worker{slot}.lock', 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            slot += 1
+            continue
+        _slot, _slot_lock = slot, lock_file
+        return slot
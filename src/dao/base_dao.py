@@ -1,28 +1,116 @@
-from typing import Any, Generic, Type, TypeVar
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generic,
+    Iterable,
+    Sequence,
+    Sized,
+    Type,
+    TypeVar,
+)
 
 from loguru import logger
 from pydantic import BaseModel
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Integer, RowMapping, Select, bindparam, delete, func, insert, tuple_, update
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
 
 from core.base_model import Base
+from core.config import settings
+from core.db import db_manager, mark_session_write, savepoint
+from core.logs import log_debug
+from core.metrics import metrics
+from core.partitioning import partition_spec
+from dao.cache import EntityCache, invalidate, uses_cache
+from dao.count import COUNT_MODES, query_estimate, supports_estimate, table_estimate
+from dao.filters import check_filter, filter_condition, filter_value, parse_filter_key
+from dao.pagination import decode_cursor, encode_cursor, parse_order
+from dao.single_flight import SingleFlight, coalesced
+from dao.write_batch import WriteBatcher
 
 T = TypeVar('T', bound=Base)
+R = TypeVar('R')
+
+# Операция над порцией элементов: возвращает результаты и ошибки по индексам внутри порции
+ChunkOperation = Callable[[Sequence[Any]], Awaitable[tuple[list[R], dict[int, str]]]]
+
+
+async def _chunked(
+    records: Iterable[R] | AsyncIterable[R],
+    size: int,
+) -> AsyncIterator[tuple[int, list[R]]]:
+    """Разбиение записей на порции: индекс первой записи порции и порция."""
+    chunk: list[R] = []
+    start = 0
+    if isinstance(records, AsyncIterable):
+        async for record in records:
+            chunk.append(record)
+            if len(chunk) >= size:
+                yield start, chunk
+                start, chunk = start + len(chunk), []
+    else:
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= size:
+                yield start, chunk
+                start, chunk = start + len(chunk), []
+    if chunk:
+        yield start, chunk
 
 
 class BaseDAO(Generic[T]):
-    """Базовый класс для всех DAO."""
+    """Базовый класс для всех DAO.
+
+    Методы DAO не фиксируют транзакцию: изменения отправляются в БД через flush,
+    а фиксация выполняется один раз на границе запроса (см. core.db.get_session_with_commit).
+
+    Если в дочернем классе задан cache, get_one_or_none_by_id сначала ищет запись в кэше,
+    а методы изменения данных удаляют измененные записи из кэша.
+
+    Если задан single_flight, одновременные одинаковые чтения строк и значений
+    в сессиях только для чтения выполняются одним запросом к БД (см. dao.single_flight).
+
+    Если задан write_batcher, create(..., batched=True) объединяет одновременные
+    создания записей в один многострочный INSERT (см. dao.write_batch).
+
+    Для секционированных по времени моделей (core.partitioning.TimePartitioned) условия
+    фильтра и курсора по колонке секционирования позволяют читать только нужные секции.
+    """
 
     model: Type[T] = None
+    cache: EntityCache | None = None
+    single_flight: SingleFlight | None = None
+    write_batcher: WriteBatcher | None = None
 
     def __init__(self) -> None:  # noqa: D107
         if self.model is None:
             raise ValueError('Модель должна быть указана в дочернем классе')
+        self._column_names = frozenset(self.model.__table__.columns.keys())
+        # Сортировка по ключу допустима только по колонкам без NULL
+        self._sortable_columns = frozenset(
+            column.key for column in self.model.__table__.columns if not column.nullable
+        )
+        # Колонка секционирования таблицы (core.partitioning) или None
+        spec = partition_spec(self.model.__table__)
+        self._partition_column = spec.column if spec is not None else None
+        if self.cache is not None:
+            metrics.register_cache(self.model.__tablename__, self.cache)
+        # Запросы, построенные для каждой формы фильтра (набора параметров поиска)
+        self._statements: dict[tuple, Select] = {}
 
     def check_filter_params(self, filter_params: dict[str, Any]) -> bool:
         """Проверка параметров для поиска.
 
+        Ключ параметра - имя поля модели, к которому может быть добавлен оператор
+        через '__': in, gt, gte, lt, lte, prefix (например, 'created_at__gte').
+
         Args:
             filter_params (dict[str, Any]): параметры для поиска
 
@@ -30,15 +118,110 @@ class BaseDAO(Generic[T]):
             bool: True, если параметры корректны, иначе False
 
         """
-        uncorrect_params = [
-            param for param in filter_params.keys() if param not in self.model.__table__.columns.keys()
-        ]
+        if filter_params.keys() <= self._column_names:
+            return True
+
+        columns = self.model.__table__.c
+        uncorrect_params = {}
+        for key, value in filter_params.items():
+            field, _ = parse_filter_key(key)
+            error = check_filter(key, value, columns.get(field))
+            if error:
+                uncorrect_params[key] = error
         if uncorrect_params:
-            logger.error(f'Неизвестные параметры для поиска: {uncorrect_params} для {self.model.__name__}')
+            logger.error(
+                'Некорректные параметры для поиска: {errors} для {model}',
+                errors=uncorrect_params,
+                model=self.model.__name__,
+            )
             return False
 
         return True
 
+    def _projection(self, fields: Sequence[str] | None, required: Sequence[str] = ()) -> tuple[str, ...]:
+        """Колонки выборки для набора полей (sparse fieldset).
+
+        Args:
+            fields (Sequence[str] | None): запрошенные поля, None - все колонки модели
+            required (Sequence[str]): поля, которые нужны самому запросу (например, ключ
+                сортировки); добавляются в выборку, если не запрошены
+
+        Returns:
+            tuple[str, ...]: имена колонок выборки без повторов
+
+        """
+        if fields is None:
+            return tuple(self.model.__table__.columns.keys())
+        unknown = [field for field in fields if field not in self._column_names]
+        if unknown:
+            raise ValueError(f'Недопустимые поля: {", ".join(unknown)}')
+        return tuple(dict.fromkeys((*fields, *required)))
+
+    def _filter_statement(
+        self,
+        kind: tuple,
+        filter_params: dict[str, Any],
+        build: Callable[[], Select],
+    ) -> tuple[Select, dict[str, Any]]:
+        """Получение запроса с условиями фильтра из кэша запросов.
+
+        Запрос строится один раз для каждой формы: вида запроса и набора полей фильтра.
+        Значения фильтра передаются как параметры, поэтому повторные вызовы не строят
+        запрос заново, а SQLAlchemy не вычисляет заново его ключ кэша компиляции.
+
+        Args:
+            kind (tuple): вид запроса, например ('all',)
+            filter_params (dict[str, Any]): проверенные параметры для поиска
+            build (Callable[[], Select]): построение запроса без условий фильтра
+
+        Returns:
+            tuple[Select, dict[str, Any]]: запрос и значения его параметров
+
+        """
+        fields = tuple(sorted((key, value is None) for key, value in filter_params.items()))
+        shape = (kind, fields)
+        statement = self._statements.get(shape)
+        if statement is None:
+            columns = self.model.__table__.c
+            statement = build().where(
+                *(
+                    filter_condition(key, columns[parse_filter_key(key)[0]], is_null)
+                    for key, is_null in fields
+                ),
+            )
+            self._statements[shape] = statement
+        params = {
+            f'f_{key}': filter_value(key, value) for key, value in filter_params.items() if value is not None
+        }
+        return statement, params
+
+    def _to_cache(self, instance: T) -> dict[str, Any]:
+        """Значения колонок объекта для сохранения в кэш."""
+        return {column.key: getattr(instance, column.key) for column in self.model.__mapper__.column_attrs}
+
+    async def _from_cache(self, session: AsyncSession, values: dict[str, Any]) -> T:
+        """Объект из значений колонок, сохраненных в кэше.
+
+        Объект добавляется в сессию как уже загруженный из БД (merge без загрузки),
+        поэтому обращения к БД не происходит. Если объект уже есть в сессии,
+        возвращается он: значения из кэша не заменяют значения объекта сессии.
+        """
+        existing = session.identity_map.get(identity_key(self.model, values['id']))
+        if existing is not None:
+            return existing
+        instance = self.model(**values)
+        make_transient_to_detached(instance)
+        return await session.merge(instance, load=False)
+
+    async def _invalidate(self, session: AsyncSession, *obj_ids: int) -> None:
+        """Удаление измененных записей из кэша (см. dao.cache.invalidate)."""
+        if self.cache is not None:
+            await invalidate(session, self.cache, self.model.__tablename__, *obj_ids)
+
+    def _cache_for(self, session: AsyncSession) -> EntityCache | None:
+        """Кэш записей для чтения в сессии или None, если сессия не должна его использовать."""
+        return self.cache if self.cache is not None and uses_cache(session) else None
+
     async def get_one_or_none_by_id(
         self,
         session: AsyncSession,
@@ -55,16 +238,32 @@ class BaseDAO(Generic[T]):
 
         """
         try:
-            logger.info(f'Ищем запись {self.model.__name__} с id={obj_id}')
-            query = select(self.model).filter_by(id=obj_id)
-            result = await session.execute(query)
+            log_debug('Ищем запись {model} с id={obj_id}', model=self.model.__name__, obj_id=obj_id)
+            cache = self._cache_for(session)
+            if cache is not None:
+                cached = await cache.get(self.model.__tablename__, obj_id)
+                if cached is not None:
+                    log_debug(
+                        'Запись {model} с id={obj_id} найдена в кэше.',
+                        model=self.model.__name__,
+                        obj_id=obj_id,
+                    )
+                    return await self._from_cache(session, cached)
+
+            query, params = self._filter_statement(('one',), {'id': obj_id}, lambda: select(self.model))
+            result = await session.execute(query, params)
             result = result.scalar_one_or_none()
-            logger.info(
-                f'Запись {self.model.__name__} с id={obj_id} {"найдена" if result else "не найдена"}.',
+            log_debug(
+                'Запись {model} с id={obj_id} {status}.',
+                model=self.model.__name__,
+                obj_id=obj_id,
+                status='найдена' if result else 'не найдена',
             )
+            if result is not None and cache is not None:
+                await cache.set(self.model.__tablename__, obj_id, self._to_cache(result))
             return result
         except SQLAlchemyError as error:
-            logger.error(f'Ошибка при поиске записи с ID {obj_id}: {error}')
+            logger.error('Ошибка при поиске записи с ID {obj_id}: {error}', obj_id=obj_id, error=error)
             raise error
 
     async def find_one_or_none(
@@ -89,38 +288,52 @@ class BaseDAO(Generic[T]):
             if not self.check_filter_params(filter_params):
                 return None
 
-            logger.info(
-                f'Ищем запись {self.model.__name__} по параметрам {filter_params}',
+            log_debug(
+                'Ищем запись {model} по параметрам {filter_params}',
+                model=self.model.__name__,
+                filter_params=filter_params,
             )
-            query = select(self.model).filter_by(**filter_params)
-            result = await session.execute(query)
+            query, params = self._filter_statement(('one',), filter_params, lambda: select(self.model))
+            result = await session.execute(query, params)
             result = result.scalar_one_or_none()
-            logger.info(
-                f'Запись {self.model.__name__} с по параметрами {filter_params} '
-                f'{"найдена" if result else "не найдена"}.',
+            log_debug(
+                'Запись {model} по параметрам {filter_params} {status}.',
+                model=self.model.__name__,
+                filter_params=filter_params,
+                status='найдена' if result else 'не найдена',
             )
 
             return result
 
         except SQLAlchemyError as error:
             logger.error(
-                f'Ошибка при поиске записи по параметрам {filter_params}: {error}',
+                'Ошибка при поиске записи по параметрам {filter_params}: {error}',
+                filter_params=filter_params,
+                error=error,
             )
             raise error
 
+    @coalesced('find_all', lambda arguments: arguments['fields'] is not None)
     async def find_all(
         self,
         session: AsyncSession,
         filter_params: dict[str, Any] | None = None,
-    ) -> list[T] | None:
+        order_by: str | None = None,
+        limit: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> list[T] | list[RowMapping] | None:
         """Поиск всех записей по параметрам.
 
         Args:
             session (AsyncSession): сессия БД
             filter_params (dict[str, Any]): параметры для поиска
+            order_by (str | None): сортировка по полю, например '-created_at'
+            limit (int | None): максимальное количество записей
+            fields (Sequence[str] | None): выбрать только эти колонки; записи
+                возвращаются строками выборки (RowMapping), а не ORM объектами
 
         Returns:
-            list[T] | None: найденные записи или None, если не найдено
+            list[T] | list[RowMapping] | None: найденные записи или None, если не найдено
 
         """
         try:
@@ -130,30 +343,397 @@ class BaseDAO(Generic[T]):
             if not self.check_filter_params(filter_params):
                 return None
 
-            logger.info(
-                f'Ищем записи {self.model.__name__} по параметрам {filter_params}',
+            projection = self._projection(fields) if fields is not None else None
+            log_debug(
+                'Ищем записи {model} по параметрам {filter_params}',
+                model=self.model.__name__,
+                filter_params=filter_params,
             )
-            query = select(self.model).filter_by(**filter_params)
-            result = await session.execute(query)
-            result = result.scalars().all()
-            logger.info(
-                f'Найдено {len(result)} записей {self.model.__name__} с параметрами {filter_params} ',
+
+            def build() -> Select:
+                if projection is None:
+                    query = select(self.model)
+                else:
+                    query = select(*(self.model.__table__.c[name] for name in projection))
+                if order_by is not None:
+                    key_names, descending = parse_order(order_by, self._sortable_columns)
+                    key_columns = [getattr(self.model, name) for name in key_names]
+                    query = query.order_by(
+                        *(column.desc() if descending else column.asc() for column in key_columns),
+                    )
+                if limit is not None:
+                    query = query.limit(bindparam('limit', type_=Integer()))
+                return query
+
+            query, params = self._filter_statement(
+                ('all', order_by, limit is not None, projection),
+                filter_params,
+                build,
+            )
+            if limit is not None:
+                params['limit'] = limit
+            result = await session.execute(query, params)
+            result = result.scalars().all() if projection is None else result.mappings().all()
+            log_debug(
+                'Найдено {count} записей {model} с параметрами {filter_params}',
+                count=len(result),
+                model=self.model.__name__,
+                filter_params=filter_params,
             )
 
             return result if result else None
 
         except SQLAlchemyError as error:
             logger.error(
-                f'Ошибка при поиске записей по параметрам {filter_params}: {error}',
+                'Ошибка при поиске записей по параметрам {filter_params}: {error}',
+                filter_params=filter_params,
+                error=error,
+            )
+            raise error
+
+    @coalesced('find_page', lambda arguments: arguments['raw'] or arguments['fields'] is not None)
+    async def find_page(
+        self,
+        session: AsyncSession,
+        filter_params: dict[str, Any] | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+        order_by: str = 'id',
+        raw: bool = False,
+        fields: Sequence[str] | None = None,
+    ) -> tuple[list[T] | list[RowMapping], str | None]:
+        """Постраничный поиск записей по ключу (keyset pagination).
+
+        Страница выбирается условием по ключу сортировки (поле сортировки и id),
+        без OFFSET, поэтому стоимость выборки не зависит от номера страницы.
+
+        Args:
+            session (AsyncSession): сессия БД
+            filter_params (dict[str, Any]): параметры для поиска
+            cursor (str | None): курсор, полученный с предыдущей страницей
+            limit (int | None): размер страницы, не больше settings.page_size_max
+            order_by (str): сортировка по полю без NULL значений, например '-created_at'
+            raw (bool): вернуть строки выборки (RowMapping) вместо ORM объектов.
+                Строки не попадают в identity map сессии, режим предназначен для чтения
+                с последующей сериализацией (см. core.serializers)
+            fields (Sequence[str] | None): выбрать только эти колонки (включает режим raw).
+                Колонки ключа сортировки выбираются всегда, так как нужны для курсора
+
+        Returns:
+            tuple[list[T] | list[RowMapping], str | None]: записи страницы и курсор
+                следующей страницы (None, если страница последняя)
+
+        """
+        try:
+            if not filter_params:
+                filter_params = {}
+
+            if not self.check_filter_params(filter_params):
+                return [], None
+
+            key_names, descending = parse_order(order_by, self._sortable_columns)
+            key_columns = [getattr(self.model, name) for name in key_names]
+            limit = min(limit or settings.page_size_default, settings.page_size_max)
+            raw = raw or fields is not None
+            projection = self._projection(fields, key_names) if raw else None
+
+            log_debug(
+                'Ищем страницу записей {model} по параметрам {filter_params}, '
+                'сортировка {order_by}, размер {limit}',
+                model=self.model.__name__,
+                filter_params=filter_params,
+                order_by=order_by,
+                limit=limit,
+            )
+
+            def build() -> Select:
+                if projection is None:
+                    query = select(self.model)
+                else:
+                    query = select(*(self.model.__table__.c[name] for name in projection))
+                if cursor is not None:
+                    key = tuple_(*key_columns)
+                    key_params = tuple_(
+                        *(bindparam(f'k_{column.key}', type_=column.type) for column in key_columns),
+                    )
+                    query = query.where(key < key_params if descending else key > key_params)
+                    first = key_columns[0]
+                    if first.key == self._partition_column:
+                        # Сравнение кортежей не отсекает секции, условие по колонке
+                        # секционирования - отсекает; на результат оно не влияет
+                        bound = bindparam(f'k_{first.key}', type_=first.type)
+                        query = query.where(first <= bound if descending else first >= bound)
+                return query.order_by(
+                    *(column.desc() if descending else column.asc() for column in key_columns),
+                ).limit(bindparam('limit', type_=Integer()))
+
+            query, params = self._filter_statement(
+                ('page', order_by, cursor is not None, projection),
+                filter_params,
+                build,
+            )
+            params['limit'] = limit + 1
+            if cursor is not None:
+                key_values = decode_cursor(
+                    cursor,
+                    order_by,
+                    tuple(column.type.python_type for column in key_columns),
+                )
+                params.update(
+                    {f'k_{column.key}': value for column, value in zip(key_columns, key_values, strict=True)},
+                )
+
+            result = await session.execute(query, params)
+            result = list(result.mappings().all() if raw else result.scalars().all())
+            next_cursor = None
+            if len(result) > limit:
+                result = result[:limit]
+                last = result[-1]
+                key_values = tuple(last[name] if raw else getattr(last, name) for name in key_names)
+                next_cursor = encode_cursor(order_by, key_values)
+            log_debug(
+                'Найдено {count} записей {model} на странице с параметрами {filter_params}',
+                count=len(result),
+                model=self.model.__name__,
+                filter_params=filter_params,
+            )
+
+            return result, next_cursor
+
+        except SQLAlchemyError as error:
+            logger.error(
+                'Ошибка при постраничном поиске записей по параметрам {filter_params}: {error}',
+                filter_params=filter_params,
+                error=error,
+            )
+            raise error
+
+    async def stream_all(
+        self,
+        session: AsyncSession,
+        filter_params: dict[str, Any] | None = None,
+        chunk_size: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """Потоковое чтение всех записей по параметрам.
+
+        Записи читаются через серверный курсор (AsyncSession.stream) порциями по chunk_size
+        строк. Выбираются колонки таблицы, а не ORM объекты, поэтому записи не попадают
+        в identity map сессии и потребление памяти не зависит от размера таблицы.
+
+        Args:
+            session (AsyncSession): сессия БД
+            filter_params (dict[str, Any]): параметры для поиска
+            chunk_size (int | None): размер порции, по умолчанию settings.stream_chunk_size
+            fields (Sequence[str] | None): выбрать только эти колонки, по умолчанию все
+
+        Yields:
+            Sequence[RowMapping]: очередная порция записей
+
+        """
+        try:
+            if not filter_params:
+                filter_params = {}
+
+            if not self.check_filter_params(filter_params):
+                return
+
+            chunk_size = chunk_size or settings.stream_chunk_size
+            projection = self._projection(fields)
+            log_debug(
+                'Потоковое чтение записей {model} по параметрам {filter_params} порциями по {chunk_size}',
+                model=self.model.__name__,
+                filter_params=filter_params,
+                chunk_size=chunk_size,
+            )
+            table = self.model.__table__
+            query, params = self._filter_statement(
+                ('stream', chunk_size, projection),
+                filter_params,
+                lambda: select(*(table.c[name] for name in projection))
+                .order_by(table.c.id)
+                .execution_options(yield_per=chunk_size),
+            )
+            result = await session.stream(query, params)
+            async for partition in result.mappings().partitions():
+                yield partition
+
+        except SQLAlchemyError as error:
+            logger.error(
+                'Ошибка при потоковом чтении записей по параметрам {filter_params}: {error}',
+                filter_params=filter_params,
+                error=error,
+            )
+            raise error
+
+    @coalesced('count')
+    async def count(
+        self,
+        session: AsyncSession,
+        filter_params: dict[str, Any] | None = None,
+        mode: str = 'exact',
+    ) -> int | None:
+        """Подсчет записей по параметрам.
+
+        Точный COUNT(*) на большой таблице читает все подходящие строки, поэтому
+        для больших выборок можно использовать оценку по статистике Postgres:
+        pg_class.reltuples для всей таблицы или оценку планировщика (EXPLAIN) для
+        выборки с условиями. Для других СУБД (например, SQLite в тестах) всегда
+        выполняется точный подсчет.
+
+        Args:
+            session (AsyncSession): сессия БД
+            filter_params (dict[str, Any]): параметры для поиска
+            mode (str): 'exact' - точно, 'estimated' - оценка, 'auto' - оценка,
+                а если она меньше settings.count_exact_threshold - точный подсчет
+
+        Returns:
+            int | None: количество записей или None, если параметры некорректны
+
+        """
+        if mode not in COUNT_MODES:
+            raise ValueError(f'Недопустимый режим подсчета: {mode}')
+        try:
+            if not filter_params:
+                filter_params = {}
+
+            if not self.check_filter_params(filter_params):
+                return None
+
+            if mode != 'exact' and supports_estimate(session):
+                estimate = None
+                if not filter_params:
+                    estimate = await table_estimate(session, self.model.__table__)
+                if estimate is None:
+                    query, params = self._filter_statement(
+                        ('estimate',),
+                        filter_params,
+                        lambda: select(self.model.__table__.c.id),
+                    )
+                    estimate = await query_estimate(session, query, params)
+                if mode == 'estimated' or estimate >= settings.count_exact_threshold:
+                    log_debug(
+                        'Оценка количества записей {model} по параметрам {filter_params}: {count}',
+                        model=self.model.__name__,
+                        filter_params=filter_params,
+                        count=estimate,
+                    )
+                    return estimate
+
+            query, params = self._filter_statement(
+                ('count',),
+                filter_params,
+                lambda: select(func.count()).select_from(self.model),
+            )
+            result = (await session.execute(query, params)).scalar_one()
+            log_debug(
+                'Количество записей {model} по параметрам {filter_params}: {count}',
+                model=self.model.__name__,
+                filter_params=filter_params,
+                count=result,
+            )
+            return result
+
+        except SQLAlchemyError as error:
+            logger.error(
+                'Ошибка при подсчете записей по параметрам {filter_params}: {error}',
+                filter_params=filter_params,
+                error=error,
+            )
+            raise error
+
+    @coalesced('updated_at')
+    async def get_updated_at_by_id(self, session: AsyncSession, obj_id: int) -> datetime | None:
+        """Время последнего изменения записи без загрузки самой записи.
+
+        Используется для условных HTTP запросов (ETag, Last-Modified): если запись
+        есть в кэше, обращения к БД не происходит.
+
+        Args:
+            session (AsyncSession): сессия БД
+            obj_id (int): id объекта
+
+        Returns:
+            datetime | None: время изменения или None, если запись не найдена
+
+        """
+        try:
+            cache = self._cache_for(session)
+            if cache is not None:
+                cached = await cache.get(self.model.__tablename__, obj_id)
+                if cached is not None:
+                    return cached['updated_at']
+            query, params = self._filter_statement(
+                ('updated_at',),
+                {'id': obj_id},
+                lambda: select(self.model.__table__.c.updated_at),
+            )
+            return (await session.execute(query, params)).scalar_one_or_none()
+        except SQLAlchemyError as error:
+            logger.error(
+                'Ошибка при получении времени изменения записи с ID {obj_id}: {error}',
+                obj_id=obj_id,
+                error=error,
             )
             raise error
 
-    async def create(self, session: AsyncSession, new_object: BaseModel) -> T:
+    async def _insert_returning(self, session: AsyncSession, rows: list[dict[str, Any]]) -> list[T]:
+        """Создание записей одним многострочным INSERT ... RETURNING."""
+        result = await session.scalars(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True),
+            rows,
+        )
+        return list(result.all())
+
+    async def _create_batch(self, rows: list[dict[str, Any]]) -> list[T | SQLAlchemyError]:
+        """Создание пакета записей WriteBatcher в собственной транзакции.
+
+        Пакет создается одним INSERT и фиксируется одним COMMIT. Если INSERT пакета
+        завершился ошибкой, записи создаются по одной (в точках сохранения), чтобы
+        ошибка одной записи не отменила создание остальных.
+
+        Returns:
+            list[T | SQLAlchemyError]: созданный объект или ошибка для каждой записи
+
+        """
+        async with db_manager.session_with_commit() as session:
+            try:
+                results: list[T | SQLAlchemyError] = await self._insert_returning(session, rows)
+            except SQLAlchemyError as error:
+                logger.warning(
+                    'Ошибка в пакете из {count} записей {model}, создаем по одной: {error}',
+                    count=len(rows),
+                    model=self.model.__name__,
+                    error=error,
+                )
+                await session.rollback()
+                results = []
+                for row in rows:
+                    try:
+                        async with savepoint(session):
+                            results.extend(await self._insert_returning(session, [row]))
+                    except SQLAlchemyError as row_error:
+                        results.append(row_error)
+            created = [result for result in results if not isinstance(result, SQLAlchemyError)]
+            await self._invalidate(session, *(obj.id for obj in created))
+        logger.info(
+            'Пакетом создано {count} записей {model}, ошибок: {errors}',
+            count=len(created),
+            model=self.model.__name__,
+            errors=len(results) - len(created),
+        )
+        return results
+
+    async def create(self, session: AsyncSession, new_object: BaseModel, batched: bool = False) -> T:
         """Создаем новый объект в БД.
 
         Args:
             session (AsyncSession): сессия БД
             new_object (BaseModel): данные объекта для создания
+            batched (bool): создать вместе с одновременными вызовами одним INSERT
+                (если задан write_batcher). Запись создается в отдельной транзакции
+                пакета и фиксируется независимо от транзакции session, поэтому режим
+                подходит только для запросов, в которых создание - единственная запись
 
         Returns:
             T: созданный объект
@@ -161,18 +741,28 @@ class BaseDAO(Generic[T]):
         """
         try:
             object_data = new_object.model_dump(exclude_unset=True)
-            logger.info(f'Создаем запись {self.model.__name__} с данными {object_data}')
+            log_debug('Создаем запись {model} с данными {data}', model=self.model.__name__, data=object_data)
+            if batched and self.write_batcher is not None:
+                new_instance = await self.write_batcher.submit(object_data, self._create_batch)
+                mark_session_write(session)
+                return new_instance
             new_instance = self.model(**object_data)
             session.add(new_instance)
-            await session.commit()
-            await session.refresh(new_instance)
+            await session.flush()
+            mark_session_write(session)
+            await self._invalidate(session, new_instance.id)
             logger.info(
-                f'Запись {self.model.__name__} с данными {object_data} создана.',
+                'Запись {model} с id={obj_id} создана.',
+                model=self.model.__name__,
+                obj_id=new_instance.id,
             )
             return new_instance
         except SQLAlchemyError as error:
             logger.error(
-                f'Ошибка при создании записи {self.model.__name__} с данными {object_data}: {error}',
+                'Ошибка при создании записи {model} с данными {data}: {error}',
+                model=self.model.__name__,
+                data=object_data,
+                error=error,
             )
             raise error
 
@@ -195,22 +785,30 @@ class BaseDAO(Generic[T]):
         """
         try:
             object_data = update_data.model_dump(exclude_unset=True)
-            logger.info(
-                f'Обновляем запись {self.model.__name__} с данными {object_data}',
+            log_debug(
+                'Обновляем запись {model} с данными {data}',
+                model=self.model.__name__,
+                data=object_data,
             )
             for key, value in object_data.items():
                 if hasattr(update_object, key):
                     setattr(update_object, key, value)
             session.add(update_object)
-            await session.commit()
-            await session.refresh(update_object)
+            await session.flush()
+            mark_session_write(session)
+            await self._invalidate(session, update_object.id)
             logger.info(
-                f'Запись {self.model.__name__} с данными {object_data} обновлена.',
+                'Запись {model} с id={obj_id} обновлена.',
+                model=self.model.__name__,
+                obj_id=update_object.id,
             )
             return update_object
         except SQLAlchemyError as error:
             logger.error(
-                f'Ошибка при обновлении записи {self.model.__name__} с данными {object_data}: {error}',
+                'Ошибка при обновлении записи {model} с данными {data}: {error}',
+                model=self.model.__name__,
+                data=object_data,
+                error=error,
             )
             raise error
 
@@ -226,14 +824,440 @@ class BaseDAO(Generic[T]):
 
         """
         try:
-            logger.info(f'Удаляем запись {self.model.__name__} с ID {delete_object.id}')
+            log_debug(
+                'Удаляем запись {model} с id={obj_id}',
+                model=self.model.__name__,
+                obj_id=delete_object.id,
+            )
             await session.delete(delete_object)
-            await session.commit()
+            await session.flush()
+            mark_session_write(session)
+            await self._invalidate(session, delete_object.id)
+            logger.info(
+                'Запись {model} с id={obj_id} удалена.',
+                model=self.model.__name__,
+                obj_id=delete_object.id,
+            )
+        except SQLAlchemyError as error:
+            logger.error(
+                'Ошибка при удалении записи {model} с id={obj_id}: {error}',
+                model=self.model.__name__,
+                obj_id=delete_object.id,
+                error=error,
+            )
+            raise error
+
+    async def update_by_id(
+        self,
+        session: AsyncSession,
+        obj_id: int,
+        update_data: BaseModel,
+    ) -> T | None:
+        """Обновляем объект в БД по его ID одним запросом UPDATE ... RETURNING.
+
+        Args:
+            session (AsyncSession): сессия БД
+            obj_id (int): id объекта
+            update_data (BaseModel): данные для обновления
+
+        Returns:
+            T | None: обновленный объект или None, если не найден
+
+        """
+        try:
+            object_data = update_data.model_dump(exclude_unset=True)
+            if not object_data:
+                return await self.get_one_or_none_by_id(session=session, obj_id=obj_id)
+
+            log_debug(
+                'Обновляем запись {model} с id={obj_id} данными {data}',
+                model=self.model.__name__,
+                obj_id=obj_id,
+                data=object_data,
+            )
+            query = (
+                update(self.model).where(self.model.id == obj_id).values(**object_data).returning(self.model)
+            )
+            result = await session.execute(query)
+            result = result.scalar_one_or_none()
+            if result is not None:
+                mark_session_write(session)
+            await self._invalidate(session, obj_id)
             logger.info(
-                f'Запись {self.model.__name__} с ID {delete_object.id} удалена.',
+                'Запись {model} с id={obj_id} {status}.',
+                model=self.model.__name__,
+                obj_id=obj_id,
+                status='обновлена' if result else 'не найдена',
             )
+            return result
         except SQLAlchemyError as error:
             logger.error(
-                f'Ошибка при удалении записи {self.model.__name__} с ID {delete_object.id}: {error}',
+                'Ошибка при обновлении записи {model} с id={obj_id}: {error}',
+                model=self.model.__name__,
+                obj_id=obj_id,
+                error=error,
             )
             raise error
+
+    async def delete_by_id(self, session: AsyncSession, obj_id: int) -> bool:
+        """Удаляем объект из БД по его ID одним запросом DELETE ... RETURNING id.
+
+        Args:
+            session (AsyncSession): сессия БД
+            obj_id (int): id объекта
+
+        Returns:
+            bool: True, если объект удален, False, если не найден
+
+        """
+        try:
+            log_debug('Удаляем запись {model} с id={obj_id}', model=self.model.__name__, obj_id=obj_id)
+            query = delete(self.model).where(self.model.id == obj_id).returning(self.model.id)
+            result = await session.execute(query)
+            deleted = result.scalar_one_or_none() is not None
+            if deleted:
+                mark_session_write(session)
+            await self._invalidate(session, obj_id)
+            logger.info(
+                'Запись {model} с id={obj_id} {status}.',
+                model=self.model.__name__,
+                obj_id=obj_id,
+                status='удалена' if deleted else 'не найдена',
+            )
+            return deleted
+        except SQLAlchemyError as error:
+            logger.error(
+                'Ошибка при удалении записи {model} с id={obj_id}: {error}',
+                model=self.model.__name__,
+                obj_id=obj_id,
+                error=error,
+            )
+            raise error
+
+    @staticmethod
+    def _error_message(error: SQLAlchemyError) -> str:
+        """Текст ошибки БД для отчета по элементу пакета."""
+        return str(getattr(error, 'orig', None) or error)
+
+    async def _run_in_chunks(
+        self,
+        session: AsyncSession,
+        items: Sequence[Any],
+        operation: ChunkOperation[R],
+        chunk_size: int | None = None,
+    ) -> tuple[list[R], dict[int, str]]:
+        """Выполнение пакетной операции порциями.
+
+        Каждая порция выполняется в отдельной точке сохранения (SAVEPOINT). Если порция
+        завершилась ошибкой, ее элементы повторяются по одному, чтобы определить ошибочные
+        элементы, не откатывая остальные.
+
+        Args:
+            session (AsyncSession): сессия БД
+            items (Sequence[Any]): элементы пакета
+            operation (ChunkOperation[R]): операция над порцией элементов
+            chunk_size (int | None): размер порции, по умолчанию settings.bulk_chunk_size
+
+        Returns:
+            tuple[list[R], dict[int, str]]: результаты и ошибки по индексам элементов пакета
+
+        """
+        chunk_size = chunk_size or settings.bulk_chunk_size
+        results: list[R] = []
+        errors: dict[int, str] = {}
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start : start + chunk_size]
+            try:
+                async with savepoint(session):
+                    chunk_results, chunk_errors = await operation(chunk)
+            except SQLAlchemyError as error:
+                logger.warning(
+                    'Ошибка в порции {first}-{last} записей {model}, повторяем по одной: {error}',
+                    first=start,
+                    last=start + len(chunk) - 1,
+                    model=self.model.__name__,
+                    error=error,
+                )
+                chunk_results, chunk_errors = [], {}
+                for offset, item in enumerate(chunk):
+                    try:
+                        async with savepoint(session):
+                            item_results, item_errors = await operation([item])
+                    except SQLAlchemyError as item_error:
+                        chunk_errors[offset] = self._error_message(item_error)
+                        continue
+                    chunk_results.extend(item_results)
+                    if item_errors:
+                        chunk_errors[offset] = item_errors[0]
+
+            results.extend(chunk_results)
+            errors.update({start + offset: message for offset, message in chunk_errors.items()})
+
+        return results, errors
+
+    async def bulk_create(
+        self,
+        session: AsyncSession,
+        new_objects: Sequence[BaseModel],
+        chunk_size: int | None = None,
+    ) -> tuple[list[T], dict[int, str]]:
+        """Пакетное создание объектов в БД.
+
+        Каждая порция создается одним многострочным INSERT ... RETURNING.
+
+        Args:
+            session (AsyncSession): сессия БД
+            new_objects (Sequence[BaseModel]): данные объектов для создания
+            chunk_size (int | None): размер порции
+
+        Returns:
+            tuple[list[T], dict[int, str]]: созданные объекты и ошибки по индексам элементов
+
+        """
+
+        async def create_chunk(chunk: Sequence[BaseModel]) -> tuple[list[T], dict[int, str]]:
+            rows = [item.model_dump(exclude_unset=True) for item in chunk]
+            return await self._insert_returning(session, rows), {}
+
+        log_debug(
+            'Пакетно создаем {count} записей {model}',
+            count=len(new_objects),
+            model=self.model.__name__,
+        )
+        created, errors = await self._run_in_chunks(session, new_objects, create_chunk, chunk_size)
+        if created:
+            mark_session_write(session)
+        await self._invalidate(session, *(obj.id for obj in created))
+        logger.info(
+            'Создано {count} записей {model}, ошибок: {errors}',
+            count=len(created),
+            model=self.model.__name__,
+            errors=len(errors),
+        )
+        return created, errors
+
+    async def bulk_update(
+        self,
+        session: AsyncSession,
+        update_objects: Sequence[BaseModel],
+        chunk_size: int | None = None,
+    ) -> tuple[list[T], dict[int, str]]:
+        """Пакетное обновление объектов в БД по их ID.
+
+        Каждая порция обновляется одним UPDATE в режиме executemany на каждый
+        набор обновляемых полей.
+
+        Args:
+            session (AsyncSession): сессия БД
+            update_objects (Sequence[BaseModel]): данные для обновления, содержащие id
+            chunk_size (int | None): размер порции
+
+        Returns:
+            tuple[list[T], dict[int, str]]: обновленные объекты и ошибки по индексам элементов
+
+        """
+
+        async def update_chunk(chunk: Sequence[BaseModel]) -> tuple[list[T], dict[int, str]]:
+            rows = [item.model_dump(exclude_unset=True) for item in chunk]
+            ids = [row['id'] for row in rows]
+            # UPDATE по первичному ключу секционированной таблицы требует и колонку
+            # секционирования (ключ таблицы - id и она); по ней же отсекаются секции
+            key_columns = [self.model.__table__.c.id]
+            if self._partition_column is not None:
+                key_columns.append(self.model.__table__.c[self._partition_column])
+            existing_ids = {
+                key[0]: key[1:]
+                for key in (await session.execute(select(*key_columns).where(self.model.id.in_(ids)))).all()
+            }
+            chunk_errors = {
+                offset: 'Запись не найдена'
+                for offset, row in enumerate(rows)
+                if row['id'] not in existing_ids
+            }
+
+            # Строки с одинаковым набором полей обновляются одним executemany
+            groups: dict[frozenset[str], list[dict[str, Any]]] = {}
+            for row in rows:
+                if row['id'] in existing_ids and len(row) > 1:
+                    row.update(zip((column.key for column in key_columns[1:]), existing_ids[row['id']]))
+                    groups.setdefault(frozenset(row), []).append(row)
+            for group in groups.values():
+                await session.execute(update(self.model), group)
+
+            found_ids = [row['id'] for row in rows if row['id'] in existing_ids]
+            result = await session.scalars(
+                select(self.model)
+                .where(self.model.id.in_(found_ids))
+                .execution_options(populate_existing=True),
+            )
+            objects = {obj.id: obj for obj in result.all()}
+            return [objects[obj_id] for obj_id in found_ids], chunk_errors
+
+        log_debug(
+            'Пакетно обновляем {count} записей {model}',
+            count=len(update_objects),
+            model=self.model.__name__,
+        )
+        updated, errors = await self._run_in_chunks(session, update_objects, update_chunk, chunk_size)
+        if updated:
+            mark_session_write(session)
+        await self._invalidate(session, *(obj.id for obj in updated))
+        logger.info(
+            'Обновлено {count} записей {model}, ошибок: {errors}',
+            count=len(updated),
+            model=self.model.__name__,
+            errors=len(errors),
+        )
+        return updated, errors
+
+    async def bulk_delete(
+        self,
+        session: AsyncSession,
+        obj_ids: Sequence[int],
+        chunk_size: int | None = None,
+    ) -> tuple[list[int], dict[int, str]]:
+        """Пакетное удаление объектов из БД по их ID.
+
+        Каждая порция удаляется одним DELETE ... WHERE id IN (...) RETURNING id.
+
+        Args:
+            session (AsyncSession): сессия БД
+            obj_ids (Sequence[int]): id объектов для удаления
+            chunk_size (int | None): размер порции
+
+        Returns:
+            tuple[list[int], dict[int, str]]: id удаленных объектов и ошибки по индексам элементов
+
+        """
+
+        async def delete_chunk(chunk: Sequence[int]) -> tuple[list[int], dict[int, str]]:
+            result = await session.scalars(
+                delete(self.model)
+                .where(self.model.id.in_(chunk))
+                .returning(self.model.id)
+                .execution_options(synchronize_session=False),
+            )
+            deleted_ids = set(result.all())
+            chunk_errors = {
+                offset: 'Запись не найдена'
+                for offset, obj_id in enumerate(chunk)
+                if obj_id not in deleted_ids
+            }
+            return [obj_id for obj_id in chunk if obj_id in deleted_ids], chunk_errors
+
+        log_debug('Пакетно удаляем {count} записей {model}', count=len(obj_ids), model=self.model.__name__)
+        deleted, errors = await self._run_in_chunks(session, obj_ids, delete_chunk, chunk_size)
+        if deleted:
+            mark_session_write(session)
+        await self._invalidate(session, *deleted)
+        logger.info(
+            'Удалено {count} записей {model}, ошибок: {errors}',
+            count=len(deleted),
+            model=self.model.__name__,
+            errors=len(errors),
+        )
+        return deleted, errors
+
+    async def _copy_chunk(
+        self,
+        connection: AsyncConnection,
+        columns: Sequence[str],
+        chunk: list[Sequence[Any]],
+    ) -> None:
+        """Загрузка порции записей: COPY в PostgreSQL (asyncpg), иначе INSERT в режиме executemany.
+
+        Ошибки COPY, полученные напрямую от asyncpg, передаются как DBAPIError.
+        """
+        table = self.model.__table__
+        if connection.dialect.driver == 'asyncpg':
+            from asyncpg import PostgresError
+
+            raw_connection = await connection.get_raw_connection()
+            try:
+                await raw_connection.driver_connection.copy_records_to_table(
+                    table.name,
+                    records=chunk,
+                    columns=list(columns),
+                    schema_name=table.schema,
+                )
+            except PostgresError as error:
+                raise DBAPIError(f'COPY {table.name}', None, error) from error
+        else:
+            await connection.execute(insert(table), [dict(zip(columns, record)) for record in chunk])
+
+    async def copy_from(
+        self,
+        records: Iterable[Sequence[Any]] | AsyncIterable[Sequence[Any]],
+        columns: Sequence[str],
+        chunk_size: int | None = None,
+        max_errors: int | None = None,
+        errors: dict[int, str] | None = None,
+        rejected: Sized = (),
+    ) -> tuple[int, dict[int, str]]:
+        """Загрузка большого количества записей без ORM объектов.
+
+        В PostgreSQL записи загружаются командой COPY (asyncpg copy_records_to_table),
+        в других БД - INSERT в режиме executemany. Записи читаются из records порциями,
+        в памяти находится не больше одной порции.
+
+        Загрузка выполняется в одной транзакции собственного соединения
+        (core.db.DatabaseSessionManager.connect): при ошибке загрузки или ее прерывании
+        не загружается ничего. Каждая порция загружается в точке сохранения; если порция
+        завершилась ошибкой, ее записи загружаются по одной, ошибочные записи пропускаются.
+
+        Args:
+            records (Iterable | AsyncIterable): значения колонок columns для каждой записи
+            columns (Sequence[str]): загружаемые колонки, остальные получают значения по умолчанию
+            chunk_size (int | None): размер порции, по умолчанию settings.import_chunk_size
+            max_errors (int | None): сколько ошибочных записей допустимо (вместе с rejected);
+                при превышении загрузка отменяется с ошибкой ValueError
+            errors (dict[int, str] | None): словарь, в который записываются ошибки
+                по мере загрузки (например, чтобы источник записей учитывал их число)
+            rejected (Sized): записи, отклоненные до загрузки (например, при проверке
+                источником records); их число учитывается в max_errors
+
+        Returns:
+            tuple[int, dict[int, str]]: количество загруженных записей и ошибки по индексам записей
+
+        """
+        chunk_size = chunk_size or settings.import_chunk_size
+        unknown = set(columns) - self._column_names
+        if unknown:
+            raise ValueError(f'Неизвестные колонки: {", ".join(sorted(unknown))}')
+
+        copied = 0
+        errors = {} if errors is None else errors
+        table = self.model.__table__
+        async with db_manager.connect() as connection:
+            async for start, chunk in _chunked(records, chunk_size):
+                try:
+                    async with connection.begin_nested():
+                        await self._copy_chunk(connection, columns, chunk)
+                except SQLAlchemyError as error:
+                    logger.warning(
+                        'Ошибка в порции {first}-{last} загрузки {model}, загружаем по одной: {error}',
+                        first=start,
+                        last=start + len(chunk) - 1,
+                        model=self.model.__name__,
+                        error=error,
+                    )
+                else:
+                    copied += len(chunk)
+                    continue
+                for offset, record in enumerate(chunk):
+                    try:
+                        async with connection.begin_nested():
+                            await connection.execute(insert(table).values(dict(zip(columns, record))))
+                        copied += 1
+                    except SQLAlchemyError as record_error:
+                        errors[start + offset] = self._error_message(record_error)
+                if max_errors is not None and len(errors) + len(rejected) > max_errors:
+                    raise ValueError(f'Загрузка отменена: больше {max_errors} ошибочных записей')
+
+        logger.info(
+            'Загружено {count} записей {model}, ошибок: {errors}',
+            count=copied,
+            model=self.model.__name__,
+            errors=len(errors),
+        )
+        return copied, errors
@@ -0,0 +1,167 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only
+
+# Ключ session.info: записи, удаляемые из кэша после коммита транзакции сессии
+INVALIDATE_KEY = 'cache_invalidate'
+
+
+class CacheBackend(ABC):
+    """Интерфейс хранилища кэша записей.
+
+    Хранилище работает со строковыми ключами и словарями значений колонок,
+    поэтому может быть как локальным для процесса, так и общим (например, Redis).
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> dict[str, Any] | None:
+        """Получение записи по ключу."""
+
+    @abstractmethod
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        """Сохранение записи по ключу."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Удаление записей по ключам."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Удаление всех записей."""
+
+
+class LRUTTLCache(CacheBackend):
+    """Локальное для процесса хранилище с ограничением размера (LRU) и времени жизни (TTL)."""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 60.0) -> None:
+        """Создание хранилища.
+
+        Args:
+            maxsize (int): максимальное количество записей
+            ttl (float): время жизни записи, сек.
+
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        """Получение записи по ключу."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        """Сохранение записи по ключу."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        """Удаление записей по ключам."""
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        """Удаление всех записей."""
+        self._data.clear()
+
+
+class EntityCache:
+    """Кэш записей модели по id.
+
+    Хранит значения колонок записи, а не ORM объекты, привязанные к сессии.
+    Ключ записи - имя таблицы модели и id.
+    """
+
+    def __init__(self, backend: CacheBackend) -> None:
+        """Создание кэша.
+
+        Args:
+            backend (CacheBackend): хранилище кэша
+
+        """
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(table_name: str, obj_id: int) -> str:
+        """Ключ записи в хранилище."""
+        return f'{table_name}:{obj_id}'
+
+    async def get(self, table_name: str, obj_id: int) -> dict[str, Any] | None:
+        """Получение записи из кэша с учетом попаданий и промахов."""
+        value = await self.backend.get(self.key(table_name, obj_id))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, table_name: str, obj_id: int, value: dict[str, Any]) -> None:
+        """Сохранение записи в кэш."""
+        await self.backend.set(self.key(table_name, obj_id), value)
+
+    async def invalidate(self, table_name: str, *obj_ids: int) -> None:
+        """Удаление записей из кэша."""
+        if obj_ids:
+            await self.backend.delete(*(self.key(table_name, obj_id) for obj_id in obj_ids))
+
+    def stats(self) -> dict[str, int]:
+        """Счетчики попаданий и промахов кэша."""
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+async def invalidate(
+    session: AsyncSession,
+    cache: EntityCache,
+    table_name: str,
+    *obj_ids: int,
+) -> None:
+    """Удаление измененных в сессии записей из кэша: сразу и еще раз после коммита.
+
+    До коммита параллельное чтение еще видит старые значения в БД и может вернуть
+    их в кэш, поэтому записи удаляются и после коммита транзакции сессии. Пока
+    в сессии есть незафиксированные изменения, она кэш не использует (uses_cache).
+    Если транзакция откатится, записи будут удалены при следующем коммите сессии,
+    что только вызовет лишний промах.
+    """
+    if obj_ids:
+        await cache.invalidate(table_name, *obj_ids)
+        session.info.setdefault(INVALIDATE_KEY, []).append((cache, table_name, obj_ids))
+
+
+def uses_cache(session: AsyncSession) -> bool:
+    """Может ли сессия читать и пополнять кэш: в ней нет незафиксированных изменений записей.
+
+    Сессия, изменившая записи, должна видеть свои изменения, а в кэш не должны
+    попадать незафиксированные значения.
+    """
+    return INVALIDATE_KEY not in session.info
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session: Session) -> None:
+    """Удаление из кэша записей, измененных в зафиксированной транзакции."""
+    if session.in_nested_transaction():
+        return
+    # Событие вызывается в greenlet AsyncSession.commit, поэтому хранилище можно дождаться
+    for cache, table_name, obj_ids in session.info.pop(INVALIDATE_KEY, ()):
+        await_only(cache.invalidate(table_name, *obj_ids))
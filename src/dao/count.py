@@ -0,0 +1,79 @@
+import json
+from typing import Any
+
+from sqlalchemy import ClauseElement, Executable, Select, Table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.visitors import InternalTraversal
+
+# Режим подсчета записей:
+# 'exact' - точный COUNT(*);
+# 'estimated' - оценка по статистике планировщика Postgres;
+# 'auto' - оценка, а если она меньше settings.count_exact_threshold - точный подсчет
+COUNT_MODES = frozenset({'exact', 'estimated', 'auto'})
+
+# Для секционированной таблицы (relkind 'p') оценка - сумма оценок ее секций
+RELTUPLES_QUERY = text(
+    "SELECT CASE WHEN c.relkind = 'p' THEN ("
+    '    SELECT sum(p.reltuples) FILTER (WHERE p.reltuples >= 0)'
+    '    FROM pg_inherits i JOIN pg_class p ON p.oid = i.inhrelid'
+    '    WHERE i.inhparent = c.oid'
+    ') ELSE c.reltuples END '
+    'FROM pg_class c WHERE c.oid = CAST(:table_name AS regclass)',
+)
+
+
+class Explain(Executable, ClauseElement):
+    """Запрос EXPLAIN (FORMAT JSON) для выражения SELECT.
+
+    Параметры выражения передаются так же, как при его обычном выполнении.
+    """
+
+    inherit_cache = True
+    _traverse_internals = [('statement', InternalTraversal.dp_clauseelement)]
+
+    def __init__(self, statement: Select) -> None:  # noqa: D107
+        self.statement = statement
+
+
+@compiles(Explain, 'postgresql')
+def _compile_explain(element: Explain, compiler: Any, **kw: Any) -> str:
+    return 'EXPLAIN (FORMAT JSON) ' + compiler.process(element.statement, **kw)
+
+
+def supports_estimate(session: AsyncSession) -> bool:
+    """Доступна ли оценка количества записей (только для Postgres)."""
+    return session.get_bind().dialect.name == 'postgresql'
+
+
+async def table_estimate(session: AsyncSession, table: Table) -> int | None:
+    """Оценка количества записей таблицы по pg_class.reltuples.
+
+    Для секционированной таблицы оценка складывается из оценок секций.
+
+    Returns:
+        int | None: оценка или None, если статистика по таблице еще не собрана
+
+    """
+    reltuples = (await session.execute(RELTUPLES_QUERY, {'table_name': table.fullname})).scalar()
+    if reltuples is None or reltuples < 0:
+        return None
+    return int(reltuples)
+
+
+async def query_estimate(session: AsyncSession, query: Select, params: dict[str, Any]) -> int:
+    """Оценка количества строк запроса по плану выполнения (EXPLAIN).
+
+    Args:
+        session (AsyncSession): сессия БД
+        query (Select): запрос
+        params (dict[str, Any]): значения параметров запроса
+
+    Returns:
+        int: оценка планировщика (Plan Rows корневого узла плана)
+
+    """
+    plan = (await session.execute(Explain(query), params)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
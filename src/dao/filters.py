@@ -0,0 +1,98 @@
+from typing import Any
+
+from sqlalchemy import Column, ColumnElement, String, bindparam
+
+# Операторы фильтра: ключ параметра имеет вид '<поле>__<оператор>', без оператора - равенство
+OPERATORS = frozenset({'eq', 'in', 'gt', 'gte', 'lt', 'lte', 'prefix'})
+
+LIKE_ESCAPE = '\\'
+
+
+def parse_filter_key(key: str) -> tuple[str, str]:
+    """Разбор ключа параметра фильтра.
+
+    Args:
+        key (str): ключ параметра, например 'created_at__gte'
+
+    Returns:
+        tuple[str, str]: имя поля и оператор
+
+    """
+    field, _, operator = key.partition('__')
+    return field, operator or 'eq'
+
+
+def check_filter(key: str, value: Any, column: Column | None) -> str | None:
+    """Проверка параметра фильтра.
+
+    Args:
+        key (str): ключ параметра
+        value (Any): значение параметра
+        column (Column | None): колонка модели для поля параметра или None, если ее нет
+
+    Returns:
+        str | None: описание ошибки или None, если параметр корректен
+
+    """
+    _, operator = parse_filter_key(key)
+    if column is None:
+        return 'неизвестное поле'
+    if operator not in OPERATORS:
+        return f'неизвестный оператор {operator}'
+    if operator == 'in' and not isinstance(value, (list, tuple, set, frozenset)):
+        return 'для оператора in нужен список значений'
+    if operator == 'prefix' and not (isinstance(column.type, String) and isinstance(value, str)):
+        return 'оператор prefix применим только к строкам'
+    if operator not in ('eq', 'in') and value is None:
+        return f'оператор {operator} не применим к None'
+    return None
+
+
+def filter_condition(key: str, column: Column, is_null: bool) -> ColumnElement[bool]:
+    """Условие запроса для параметра фильтра.
+
+    Значение передается параметром запроса с именем 'f_<ключ>'. Условия сравнения
+    и префиксного поиска (LIKE 'значение%') могут использовать индекс по колонке.
+
+    Args:
+        key (str): ключ параметра
+        column (Column): колонка модели
+        is_null (bool): значение параметра - None (только для равенства)
+
+    Returns:
+        ColumnElement[bool]: условие запроса
+
+    """
+    _, operator = parse_filter_key(key)
+    name = f'f_{key}'
+    if operator == 'eq' and is_null:
+        return column.is_(None)
+    if operator == 'in':
+        return column.in_(bindparam(name, expanding=True, type_=column.type))
+    param = bindparam(name, type_=column.type)
+    if operator == 'prefix':
+        return column.like(param, escape=LIKE_ESCAPE)
+    if operator == 'gt':
+        return column > param
+    if operator == 'gte':
+        return column >= param
+    if operator == 'lt':
+        return column < param
+    if operator == 'lte':
+        return column <= param
+    return column == param
+
+
+def escape_like(value: str) -> str:
+    """Экранирование спецсимволов LIKE в значении (символ экранирования LIKE_ESCAPE)."""
+    return value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace('%', r'\%').replace('_', r'\_')
+
+
+def filter_value(key: str, value: Any) -> Any:
+    """Значение параметра запроса для параметра фильтра."""
+    _, operator = parse_filter_key(key)
+    if operator == 'prefix':
+        return f'{escape_like(value)}%'
+    if operator == 'in':
+        return list(value)
+    return value
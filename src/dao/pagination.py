@@ -0,0 +1,72 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Collection
+
+
+def parse_order(order_by: str, sortable: Collection[str]) -> tuple[tuple[str, ...], bool]:
+    """Разбор параметра сортировки.
+
+    Ключ сортировки дополняется полем id, чтобы он был уникальным и страницы
+    можно было выбирать условием по ключу.
+
+    Args:
+        order_by (str): параметр сортировки, например '-created_at'.
+            Ведущий '-' означает сортировку по убыванию.
+        sortable (Collection[str]): поля, по которым допустима сортировка
+
+    Returns:
+        tuple[tuple[str, ...], bool]: колонки ключа и признак сортировки по убыванию
+
+    """
+    descending = order_by.startswith('-')
+    key = order_by.removeprefix('-')
+    if key not in sortable:
+        raise ValueError(f'Недопустимая сортировка: {order_by}')
+    return ((key,) if key == 'id' else (key, 'id')), descending
+
+
+def encode_cursor(order_by: str, values: tuple[Any, ...]) -> str:
+    """Кодирование курсора следующей страницы.
+
+    Args:
+        order_by (str): параметр сортировки
+        values (tuple[Any, ...]): значения ключа последней записи страницы
+
+    Returns:
+        str: непрозрачный курсор
+
+    """
+    payload = {
+        'o': order_by,
+        'k': [value.isoformat() if isinstance(value, datetime) else value for value in values],
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str, order_by: str, python_types: tuple[type, ...]) -> tuple[Any, ...]:
+    """Декодирование курсора.
+
+    Args:
+        cursor (str): курсор, полученный от клиента
+        order_by (str): ожидаемый параметр сортировки
+        python_types (tuple[type, ...]): типы значений ключа
+
+    Returns:
+        tuple[Any, ...]: значения ключа, после которых начинается страница
+
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = payload['k']
+        if payload['o'] != order_by or len(values) != len(python_types):
+            raise ValueError
+        return tuple(
+            datetime.fromisoformat(value) if python_type is datetime else python_type(value)
+            for value, python_type in zip(values, python_types, strict=True)
+        )
+    except (binascii.Error, TypeError, KeyError, ValueError) as error:
+        raise ValueError('Некорректный курсор') from error
@@ -0,0 +1,146 @@
+from typing import Any, Sequence
+
+from loguru import logger
+from sqlalchemy import Float, Integer, RowMapping, Select, String, and_, bindparam, func, literal, or_, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.logs import log_debug
+from dao.filters import LIKE_ESCAPE, escape_like
+from dao.pagination import decode_cursor, encode_cursor
+from dao.single_flight import coalesced
+
+# Имя колонки выборки с рангом записи в результатах поиска
+SEARCH_RANK = 'search_rank'
+
+
+def supports_trigram(session: AsyncSession) -> bool:
+    """Доступен ли поиск по триграммам (pg_trgm, только для Postgres)."""
+    return session.get_bind().dialect.name == 'postgresql'
+
+
+class SearchMixin:
+    """Примесь к BaseDAO: ранжированный нечеткий поиск по текстовым колонкам.
+
+    Колонки поиска задаются в search_fields дочернего класса, для них должны быть
+    созданы GIN индексы с gin_trgm_ops (расширение pg_trgm). Запись находится, если
+    колонка похожа на строку поиска (оператор %) или содержит ее (ILIKE '%...%'),
+    оба условия используют индекс. Ранг записи - наибольшее сходство (similarity)
+    по колонкам поиска.
+
+    Без Postgres (например, SQLite в тестах) выполняется поиск подстроки без ранжирования.
+
+    Пример:
+        class UserDao(SearchMixin, BaseDAO[User]):
+            model = User
+            search_fields = ('name', 'full_name')
+    """
+
+    search_fields: tuple[str, ...] = ()
+
+    @coalesced('search')
+    async def search(
+        self,
+        session: AsyncSession,
+        query: str,
+        filter_params: dict[str, Any] | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> tuple[list[RowMapping], str | None]:
+        """Поиск записей, отсортированных по рангу, с постраничной выборкой по ключу.
+
+        Ключ страницы - пара (ранг, id), курсор действителен только для той же строки поиска.
+
+        Args:
+            session (AsyncSession): сессия БД
+            query (str): строка поиска
+            filter_params (dict[str, Any]): дополнительные параметры для поиска
+            cursor (str | None): курсор, полученный с предыдущей страницей
+            limit (int | None): размер страницы, не больше settings.page_size_max
+            fields (Sequence[str] | None): выбрать только эти колонки, по умолчанию все
+
+        Returns:
+            tuple[list[RowMapping], str | None]: строки страницы (с рангом в колонке
+                SEARCH_RANK) и курсор следующей страницы (None, если страница последняя)
+
+        """
+        if not self.search_fields:
+            raise ValueError(f'Для {self.model.__name__} не заданы поля поиска')
+        try:
+            if not filter_params:
+                filter_params = {}
+
+            if not self.check_filter_params(filter_params):
+                return [], None
+
+            table = self.model.__table__
+            trigram = supports_trigram(session)
+            projection = self._projection(fields, ('id',))
+            limit = min(limit or settings.page_size_default, settings.page_size_max)
+            order_key = f'search:{query}'
+
+            log_debug(
+                'Поиск записей {model} по строке {query!r} и параметрам {filter_params}, размер {limit}',
+                model=self.model.__name__,
+                query=query,
+                filter_params=filter_params,
+                limit=limit,
+            )
+
+            def build() -> Select:
+                columns = [table.c[name] for name in self.search_fields]
+                search_value = bindparam('q', type_=String())
+                pattern = bindparam('q_pattern', type_=String())
+                if trigram:
+                    rank = func.greatest(*(func.similarity(column, search_value) for column in columns))
+                    condition = or_(
+                        *(column.op('%')(search_value) for column in columns),
+                        *(column.ilike(pattern, escape=LIKE_ESCAPE) for column in columns),
+                    )
+                else:
+                    rank = literal(0.0, Float())
+                    condition = or_(*(column.ilike(pattern, escape=LIKE_ESCAPE) for column in columns))
+                rank_column = rank.label(SEARCH_RANK)
+                statement = select(*(table.c[name] for name in projection), rank_column).where(condition)
+                if cursor is not None:
+                    rank_param = bindparam('k_rank', type_=Float())
+                    statement = statement.where(
+                        or_(
+                            rank < rank_param,
+                            and_(rank == rank_param, table.c.id > bindparam('k_id', type_=Integer())),
+                        ),
+                    )
+                return statement.order_by(rank_column.desc(), table.c.id.asc()).limit(
+                    bindparam('limit', type_=Integer()),
+                )
+
+            statement, params = self._filter_statement(
+                ('search', trigram, cursor is not None, projection),
+                filter_params,
+                build,
+            )
+            params.update({'q': query, 'q_pattern': f'%{escape_like(query)}%', 'limit': limit + 1})
+            if cursor is not None:
+                params['k_rank'], params['k_id'] = decode_cursor(cursor, order_key, (float, int))
+
+            result = await session.execute(statement, params)
+            rows = list(result.mappings().all())
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                last = rows[-1]
+                next_cursor = encode_cursor(order_key, (last[SEARCH_RANK], last['id']))
+            log_debug(
+                'Найдено {count} записей {model} по строке {query!r}',
+                count=len(rows),
+                model=self.model.__name__,
+                query=query,
+            )
+
+            return rows, next_cursor
+
+        except SQLAlchemyError as error:
+            logger.error('Ошибка при поиске записей по строке {query!r}: {error}', query=query, error=error)
+            raise error
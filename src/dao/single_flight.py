@@ -0,0 +1,142 @@
+import asyncio
+import functools
+import inspect
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.db import ReadOnlySession
+from core.metrics import metrics
+
+R = TypeVar('R')
+
+
+class _Flight:
+    """Выполняющееся чтение и число ожидающих его вызовов."""
+
+    __slots__ = ('task', 'waiters')
+
+    def __init__(self, task: asyncio.Task) -> None:  # noqa: D107
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Объединение одновременных одинаковых чтений (single-flight).
+
+    Пока чтение с некоторым ключом выполняется, вызовы с тем же ключом не выполняют
+    его повторно, а ждут и получают тот же результат (или ту же ошибку). Результат
+    не кэшируется: следующий вызов после завершения чтения выполняет его заново.
+
+    Чтение выполняется в отдельной задаче, поэтому отмена одного из вызовов
+    (например, клиент закрыл соединение) не прерывает чтение для остальных.
+    Если отменены все ожидающие вызовы, чтение отменяется.
+    """
+
+    def __init__(self) -> None:  # noqa: D107
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def do(self, key: Hashable, operation: str, read: Callable[[], Awaitable[R]]) -> R:
+        """Выполнение чтения или ожидание уже выполняющегося чтения с тем же ключом.
+
+        Args:
+            key (Hashable): ключ чтения
+            operation (str): имя операции в метриках, например 'User.find_page'
+            read (Callable[[], Awaitable[R]]): чтение
+
+        Returns:
+            R: результат чтения, общий для всех одновременных вызовов (не изменять)
+
+        """
+        stats = metrics.flight(operation)
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(read()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            stats.executed += 1
+        else:
+            stats.shared += 1
+        flight.waiters += 1
+        stats.waiters += 1
+        stats.max_waiters = max(stats.max_waiters, flight.waiters)
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            stats.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # Результат больше никому не нужен
+                self._forget(key, flight)
+                flight.task.cancel()
+
+
+def freeze(value: Any) -> Hashable:
+    """Значение аргументов в виде, пригодном для ключа: словари и списки - кортежи."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def coalesced(
+    operation: str,
+    shareable: Callable[[dict[str, Any]], bool] | None = None,
+) -> Callable[[Callable[..., Awaitable[R]]], Callable[..., Awaitable[R]]]:
+    """Декоратор метода чтения DAO: одновременные одинаковые вызовы выполняются один раз.
+
+    Действует, если у DAO задан single_flight и вызов выполняется в сессии только
+    для чтения (в сессии с записью чтение должно видеть изменения своей транзакции).
+    Ключ - модель, операция, движок сессии (основной сервер или реплика) и аргументы
+    вызова. Общее чтение выполняется в собственной сессии на том же движке, поэтому
+    не зависит от завершения запроса, начавшего его, а сессии остальных вызовов
+    не получают соединение из пула.
+
+    Метод должен возвращать строки выборки или значения, а не ORM объекты:
+    результат используется несколькими вызовами.
+
+    Args:
+        operation (str): имя операции для ключа и метрик
+        shareable (Callable | None): проверка аргументов вызова (без self и session),
+            можно ли объединять вызов; например, только при выборке строк
+
+    """
+
+    def decorator(method: Callable[..., Awaitable[R]]) -> Callable[..., Awaitable[R]]:
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(self: Any, *args: Any, **kwargs: Any) -> R:
+            if self.single_flight is None:
+                return await method(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            del arguments['self']
+            session: AsyncSession = arguments.pop('session')
+            if not isinstance(session.sync_session, ReadOnlySession) or (
+                shareable is not None and not shareable(arguments)
+            ):
+                return await method(self, *args, **kwargs)
+
+            bind = session.bind
+
+            async def read() -> R:
+                async with AsyncSession(
+                    bind=bind,
+                    expire_on_commit=False,
+                    sync_session_class=ReadOnlySession,
+                ) as shared_session:
+                    return await method(self, session=shared_session, **arguments)
+
+            key = (self.model.__tablename__, operation, bind, freeze(arguments))
+            return await self.single_flight.do(key, f'{self.model.__name__}.{operation}', read)
+
+        return wrapper
+
+    return decorator
@@ -1,11 +1,28 @@
+from core.config import settings
 from dao.base_dao import BaseDAO
+from dao.cache import EntityCache, LRUTTLCache
+from dao.search import SearchMixin
+from dao.single_flight import SingleFlight
+from dao.write_batch import WriteBatcher
 from models.user import User
 
 
-class UserDao(BaseDAO[User]):
+class UserDao(SearchMixin, BaseDAO[User]):
     """DAO для работы с пользователями."""
 
     model = User
+    search_fields = ('name', 'full_name')
+    cache = (
+        EntityCache(LRUTTLCache(maxsize=settings.entity_cache_maxsize, ttl=settings.entity_cache_ttl))
+        if settings.entity_cache_enabled
+        else None
+    )
+    single_flight = SingleFlight() if settings.db_single_flight_enabled else None
+    write_batcher = (
+        WriteBatcher(window=settings.db_write_batch_window, max_size=settings.db_write_batch_max_size)
+        if settings.db_write_batch_enabled
+        else None
+    )
 
 
 user_dao = UserDao()
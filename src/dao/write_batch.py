@@ -0,0 +1,84 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+# Запись пакета: результаты по элементам в том же порядке, ошибка элемента - исключение
+BatchWrite = Callable[[list[Any]], Awaitable[list[Any]]]
+
+
+class WriteBatcher:
+    """Объединение одновременных записей в пакеты (micro-batching).
+
+    Элементы, поступившие в течение window секунд после первого элемента пакета,
+    записываются одной операцией (например, многострочным INSERT в одной транзакции).
+    Пакет записывается сразу, как только в нем набирается max_size элементов.
+
+    Запись пакета выполняется в отдельной задаче: отмена ожидающего вызова
+    не прерывает запись остальных элементов. Элемент отмененного вызова, еще
+    не отправленный на запись, в пакет не попадает.
+    """
+
+    def __init__(self, window: float = 0.002, max_size: int = 100) -> None:
+        """Создание накопителя.
+
+        Args:
+            window (float): сколько секунд собирать пакет после первого элемента
+            max_size (int): максимальный размер пакета
+
+        """
+        self.window = window
+        self.max_size = max_size
+        self._pending: list[tuple[Any, asyncio.Future]] = []
+        self._write: BatchWrite | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, item: Any, write: BatchWrite) -> Any:
+        """Добавление элемента в пакет и ожидание результата его записи.
+
+        Args:
+            item (Any): элемент пакета
+            write (BatchWrite): запись пакета
+
+        Returns:
+            Any: результат записи элемента; ошибка элемента выбрасывается как исключение
+
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        self._write = write
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """Отправка накопленного пакета на запись."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = [(item, future) for item, future in self._pending if not future.done()]
+        self._pending = []
+        if batch:
+            task = asyncio.create_task(self._run(batch, self._write))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    async def _run(batch: list[tuple[Any, asyncio.Future]], write: BatchWrite) -> None:
+        """Запись пакета и передача результатов ожидающим вызовам."""
+        try:
+            results = await write([item for item, _ in batch])
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, future), result in zip(batch, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
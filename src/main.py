@@ -1,34 +1,100 @@
+import atexit
+import os
 import sys
 
 import uvicorn
+from fastapi import FastAPI
 from loguru import logger
 
 from api.fastapi_app import get_fastapi_app
 from core.config import BASE_DIR, settings
+from core.logs import DEFAULT_CONTEXT, json_format
+from core.slow_queries import is_query_report
+from core.workers import worker_slot
 
 
-def loger_config() -> None:
-    """Конфигурация логирования."""
+def loger_config(worker: int | None = None) -> None:
+    """Конфигурация логирования.
+
+    В файл пишется JSON по записи на строку, запись в файл буферизуется
+    (settings.log_buffer_size) и выполняется в отдельном потоке (enqueue). Сообщение
+    и JSON формируются в потоке, вызвавшем логгер, поэтому значения передаются
+    в сообщение полями формата ('... {name}', name=...), а не f-строкой: сообщение
+    не форматируется, если запись его уровня отключена.
+
+    Ротация файлов loguru не согласуется между процессами, поэтому при нескольких
+    рабочих процессах каждый пишет в свои файлы: log/fasql.{worker}.log.
+
+    Args:
+        worker (int | None): номер рабочего процесса (None - единственный процесс)
+
+    """
+    suffix = '' if worker is None else f'.{worker}'
     logger.remove()
+    # При завершении процесса: запись буфера в файл и остановка потоков записи
+    atexit.register(logger.remove)
+    logger.configure(extra=DEFAULT_CONTEXT)
     logger.add(
-        BASE_DIR / 'log/fasql.log',
+        BASE_DIR / f'log/fasql{suffix}.log',
         rotation='100 MB',
         retention=10,
-        format='{time:DD-MM-YYYY HH:mm:ss} {level} {module} {function} {message}',
-        level='INFO',
+        format=json_format,
+        level=settings.log_level,
         enqueue=True,
-        colorize=True,
+        buffering=settings.log_buffer_size,
+        filter=lambda record: not is_query_report(record),
     )
     logger.add(
         sys.stdout,
-        format='<g>{time:DD-MM-YYYY HH:mm:ss}</g> <b>{level}</b> {module} {function} {message}',
-        level='INFO',
+        format=(
+            '<g>{time:DD-MM-YYYY HH:mm:ss}</g> <b>{level}</b> {extra[request_id]} '
+            '{module} {function} {message}'
+        ),
+        level=settings.log_level,
         enqueue=True,
         colorize=True,
+        filter=lambda record: not is_query_report(record),
     )
+    if settings.slow_query_log_enabled:
+        # Отчеты о медленных и повторяющихся запросах: JSON по записи на строку
+        # (запрос, параметры без значений, длительность, план) для анализа
+        logger.add(
+            BASE_DIR / f'log/slow_queries{suffix}.log',
+            rotation='100 MB',
+            retention=10,
+            level='WARNING',
+            enqueue=True,
+            serialize=True,
+            filter=is_query_report,
+        )
+
+
+def create_app() -> FastAPI:
+    """Фабрика приложения, вызывается uvicorn в каждом рабочем процессе.
+
+    Рабочие процессы запускаются заново (spawn), а не копируются из родительского,
+    поэтому логирование настраивается, а соединения с БД открываются (lifespan)
+    уже в рабочем процессе.
+    """
+    worker = worker_slot(BASE_DIR / 'log') if settings.app_workers > 1 else None
+    loger_config(worker)
+    logger.info('Запуск рабочего процесса {worker}, pid {pid}', worker=worker or 0, pid=os.getpid())
+    return get_fastapi_app()
 
 
 if __name__ == '__main__':
-    loger_config()
-    logger.info('Запуск приложения.')
-    uvicorn.run(get_fastapi_app(), host='0.0.0.0', port=settings.app_port)
+    logger.info('Запуск приложения, рабочих процессов: {workers}', workers=settings.app_workers)
+    # При нескольких рабочих процессах uvicorn перезапускает завершившиеся процессы,
+    # по SIGTERM дожидается завершения начатых запросов (app_graceful_timeout),
+    # по SIGHUP поочередно перезапускает процессы
+    uvicorn.run(
+        'main:create_app',
+        factory=True,
+        app_dir=str(BASE_DIR),
+        host='0.0.0.0',
+        port=settings.app_port,
+        workers=settings.app_workers,
+        loop=settings.app_loop,
+        http=settings.app_http,
+        timeout_graceful_shutdown=settings.app_graceful_timeout,
+    )
@@ -6,8 +6,19 @@ from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
+from alembic.autogenerate import renderers
+from alembic.operations import MigrateOperation, Operations, ops
 
 from core.config import settings
+from core.partitioning import (
+    PartitionSpec,
+    create_default_partition_sql,
+    create_partition_sql,
+    is_partition_of,
+    partition_spec,
+    partitioned_tables,
+    utc_now,
+)
 from models import Base
 
 
@@ -28,6 +39,75 @@ config.set_main_option('sqlalchemy.url', settings.database_url)
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+
+# Секционированные по времени таблицы (core.partitioning.TimePartitioned)
+
+
+@Operations.register_operation('create_partitions')
+class CreatePartitionsOp(MigrateOperation):
+    """Создание секций таблицы: секции по умолчанию, текущей и premake следующих.
+
+    В миграции: op.create_partitions('events', interval='month', premake=3).
+    Автогенерация добавляет операцию после создания секционируемой таблицы.
+    Дальше будущие секции создает обслуживание (core.partitioning.PartitionMaintenance).
+    """
+
+    def __init__(self, table_name: str, interval: str = 'month', premake: int = 3) -> None:  # noqa: D107
+        self.table_name = table_name
+        self.interval = interval
+        self.premake = premake
+
+    @classmethod
+    def create_partitions(
+        cls,
+        operations: Operations,
+        table_name: str,
+        interval: str = 'month',
+        premake: int = 3,
+    ) -> None:
+        """Создание секций таблицы."""
+        return operations.invoke(cls(table_name, interval, premake))
+
+
+@Operations.implementation_for(CreatePartitionsOp)
+def create_partitions(operations: Operations, operation: CreatePartitionsOp) -> None:
+    """Выполнение op.create_partitions."""
+    spec = PartitionSpec(interval=operation.interval, premake=operation.premake)
+    operations.execute(create_default_partition_sql(operation.table_name))
+    for start, end in spec.upcoming(utc_now()):
+        operations.execute(create_partition_sql(operation.table_name, start, end))
+
+
+@renderers.dispatch_for(CreatePartitionsOp)
+def render_create_partitions(autogen_context, operation: CreatePartitionsOp) -> str:
+    """Текст op.create_partitions в автогенерируемой миграции."""
+    return (
+        f'op.create_partitions({operation.table_name!r}, '
+        f'interval={operation.interval!r}, premake={operation.premake})'
+    )
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """Секции таблиц (в том числе отсоединенные) не сравниваются с моделями."""
+    if type_ == 'table' and reflected and compare_to is None:
+        return not any(is_partition_of(table.name, name) for table in partitioned_tables(target_metadata))
+    return True
+
+
+def process_revision_directives(context, revision, directives) -> None:
+    """Создание секций (op.create_partitions) после создания секционируемой таблицы."""
+    for upgrade_ops in directives[0].upgrade_ops_list:
+        operations = []
+        for operation in upgrade_ops.ops:
+            operations.append(operation)
+            if isinstance(operation, ops.CreateTableOp) and operation.table_name in target_metadata.tables:
+                spec = partition_spec(target_metadata.tables[operation.table_name])
+                if spec is not None:
+                    operations.append(CreatePartitionsOp(operation.table_name, spec.interval, spec.premake))
+        upgrade_ops.ops[:] = operations
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -52,6 +132,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
+        process_revision_directives=process_revision_directives,
     )
 
     with context.begin_transaction():
@@ -59,7 +141,12 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        process_revision_directives=process_revision_directives,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,38 @@
+"""Add user list indexes
+
+Revision ID: ba211a7200a6
+Revises: d108adeb32a1
+Create Date: 2026-10-17 10:15:42.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ba211a7200a6'
+down_revision: Union[str, None] = 'd108adeb32a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Индексы создаются без блокировки записи в таблицу (CONCURRENTLY),
+    # что невозможно внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index('ix__users__created_at_id', 'users', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix__users__updated_at_id', 'users', ['updated_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix__users__name_id', 'users', ['name', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix__users__name_pattern', 'users', ['name'], unique=False, postgresql_ops={'name': 'varchar_pattern_ops'}, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix__users__name_pattern', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix__users__name_id', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix__users__updated_at_id', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix__users__created_at_id', table_name='users', postgresql_concurrently=True)
@@ -0,0 +1,34 @@
+"""Add user search indexes
+
+Revision ID: 3f9c2e7d41b8
+Revises: ba211a7200a6
+Create Date: 2026-10-17 11:40:08.530217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2e7d41b8'
+down_revision: Union[str, None] = 'ba211a7200a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        op.create_index('ix__users__name_trgm', 'users', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}, postgresql_concurrently=True)
+        op.create_index('ix__users__full_name_trgm', 'users', ['full_name'], unique=False, postgresql_using='gin', postgresql_ops={'full_name': 'gin_trgm_ops'}, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix__users__full_name_trgm', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix__users__name_trgm', table_name='users', postgresql_concurrently=True)
+    # Расширение pg_trgm не удаляется: его могут использовать другие объекты БД
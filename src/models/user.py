@@ -1,6 +1,6 @@
 from typing import Optional
 
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from core.base_model import Base
@@ -11,3 +11,25 @@ class User(Base):
 
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     full_name: Mapped[Optional[str]]
+
+    # Индексы для фильтрации и сортировки списка пользователей (постраничная выборка
+    # по ключу '<поле>, id', диапазоны дат, поиск по префиксу имени) и триграммные
+    # индексы для нечеткого поиска (см. dao.search.SearchMixin)
+    __table_args__ = (
+        Index('ix__users__created_at_id', 'created_at', 'id'),
+        Index('ix__users__updated_at_id', 'updated_at', 'id'),
+        Index('ix__users__name_id', 'name', 'id'),
+        Index('ix__users__name_pattern', 'name', postgresql_ops={'name': 'varchar_pattern_ops'}),
+        Index(
+            'ix__users__name_trgm',
+            'name',
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+        ),
+        Index(
+            'ix__users__full_name_trgm',
+            'full_name',
+            postgresql_using='gin',
+            postgresql_ops={'full_name': 'gin_trgm_ops'},
+        ),
+    )
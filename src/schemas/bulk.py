@@ -0,0 +1,37 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar('T')
+
+
+class BulkItemError(BaseModel):
+    """Класс, представляющий ошибку обработки элемента пакета."""
+
+    index: int
+    detail: str
+
+
+class BulkResult(BaseModel, Generic[T]):
+    """Класс, представляющий результат пакетной операции."""
+
+    items: list[T]
+    errors: list[BulkItemError] = []
+
+    @classmethod
+    def from_dao(cls, items: list, errors: dict[int, str]) -> 'BulkResult[T]':
+        """Формирование результата из ответа пакетного метода DAO."""
+        return cls(
+            items=items,
+            errors=[BulkItemError(index=index, detail=detail) for index, detail in sorted(errors.items())],
+        )
+
+
+class ImportResult(BaseModel):
+    """Класс, представляющий результат потоковой загрузки записей."""
+
+    imported: int
+    rejected: int
+    errors: list[BulkItemError] = []
+    elapsed: float
+    rows_per_second: float
@@ -0,0 +1,7 @@
+from typing import Literal
+
+# Формат потоковой выгрузки
+ExportFormat = Literal['ndjson', 'csv']
+
+# Формат потоковой загрузки
+ImportFormat = Literal['ndjson', 'csv']
@@ -0,0 +1,17 @@
+from typing import Generic, Literal, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar('T')
+
+# Режим подсчета общего количества записей (см. BaseDAO.count)
+CountMode = Literal['exact', 'estimated', 'auto']
+
+TOTAL_COUNT_HEADER = 'X-Total-Count'
+
+
+class Page(BaseModel, Generic[T]):
+    """Класс, представляющий страницу списка объектов."""
+
+    items: list[T]
+    next_cursor: str | None = None
@@ -1,7 +1,11 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+from core.config import settings
+from schemas.export import ExportFormat
+from schemas.pagination import CountMode
 
 
 class UserDB(BaseModel):
@@ -17,6 +21,94 @@ class UserDB(BaseModel):
         from_attributes = True
 
 
+# Сортировка списка пользователей, ведущий '-' - по убыванию
+UserOrder = Literal[
+    'id',
+    '-id',
+    'name',
+    '-name',
+    'created_at',
+    '-created_at',
+    'updated_at',
+    '-updated_at',
+]
+
+
+class UserFilter(BaseModel):
+    """Класс, представляющий параметры фильтрации списка пользователей.
+
+    Имена полей соответствуют параметрам поиска BaseDAO: '<поле>__<оператор>'.
+    """
+
+    id__in: Optional[list[int]] = None
+    name: Optional[str] = None
+    name__prefix: Optional[str] = Field(None, min_length=1)
+    full_name: Optional[str] = None
+    created_at__gte: Optional[datetime] = None
+    created_at__lt: Optional[datetime] = None
+    updated_at__gte: Optional[datetime] = None
+    updated_at__lt: Optional[datetime] = None
+
+    def filter_params(self) -> dict:
+        """Параметры для поиска в BaseDAO без незаданных полей."""
+        return self.model_dump(include=set(UserFilter.model_fields), exclude_none=True)
+
+
+class UserFields(BaseModel):
+    """Класс, представляющий выбор полей пользователя в ответе (sparse fieldset)."""
+
+    fields: Optional[str] = Field(
+        None,
+        description='Поля в ответе через запятую, например "id,name". По умолчанию все поля UserDB',
+    )
+
+    @field_validator('fields')
+    @classmethod
+    def check_fields(cls, value: Optional[str]) -> Optional[str]:
+        """Проверка, что все поля есть в UserDB."""
+        if value is None:
+            return None
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in names if name not in UserDB.model_fields]
+        if not names or unknown:
+            raise ValueError(f'Недопустимые поля: {", ".join(unknown) or value}')
+        return ','.join(dict.fromkeys(names))
+
+    def field_names(self) -> tuple[str, ...]:
+        """Поля ответа в порядке запроса или все поля UserDB."""
+        return tuple(self.fields.split(',')) if self.fields else tuple(UserDB.model_fields)
+
+
+class UserListParams(UserFilter, UserFields):
+    """Класс, представляющий параметры запроса страницы списка пользователей."""
+
+    cursor: Optional[str] = None
+    limit: int = Field(settings.page_size_default, ge=1, le=settings.page_size_max)
+    order_by: UserOrder = 'id'
+    count: Optional[CountMode] = Field(
+        None,
+        description='Подсчет X-Total-Count. Без параметра не выполняется (если не задан COUNT_MODE_DEFAULT)',
+    )
+
+
+class UserSearchParams(UserFilter, UserFields):
+    """Класс, представляющий параметры поиска пользователей."""
+
+    q: str = Field(..., min_length=1, max_length=100, description='Строка поиска по имени и полному имени')
+    cursor: Optional[str] = None
+    limit: int = Field(settings.page_size_default, ge=1, le=settings.page_size_max)
+
+
+class UserExportParams(UserFilter, UserFields):
+    """Класс, представляющий параметры выгрузки пользователей."""
+
+    export_format: ExportFormat = Field('ndjson', alias='format')
+
+    class Config:  # noqa: D106
+        # FastAPI передает значения полей модели параметров запроса по имени поля
+        populate_by_name = True
+
+
 class UserCreate(BaseModel):
     """Класс, представляющий данные пользователя при создании."""
 
@@ -29,3 +121,9 @@ class UserUpdate(BaseModel):
 
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     full_name: Optional[str] = Field(None)
+
+
+class UserBulkUpdate(UserUpdate):
+    """Класс, представляющий данные пользователя при пакетном обновлении."""
+
+    id: int
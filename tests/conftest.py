@@ -0,0 +1,42 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import pytest
+
+# Настройки без файла infra/.env: тесты не обращаются к PostgreSQL
+os.environ.setdefault('IS_DOCKER', 'docker')
+for name, value in (
+    ('POSTGRES_USER', 'test'),
+    ('POSTGRES_PASSWORD', 'test'),
+    ('POSTGRES_DB', 'test'),
+    ('POSTGRES_SERVER', 'localhost'),
+    ('POSTGRES_PORT', '5432'),
+):
+    os.environ.setdefault(name, value)
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.db import db_manager  # noqa: E402
+from models import Base  # noqa: E402
+
+
+@pytest.fixture
+def run_db(tmp_path: Path) -> Callable[[Callable[[], Awaitable[Any]]], Any]:
+    """Запуск теста в цикле событий с БД SQLite во временном файле."""
+
+    def run(test: Callable[[], Awaitable[Any]]) -> Any:
+        async def main() -> Any:
+            db_manager.init(db_url=f'sqlite+aiosqlite:///{tmp_path / "test.db"}')
+            try:
+                async with db_manager.connect() as connection:
+                    await connection.run_sync(Base.metadata.create_all)
+                return await test()
+            finally:
+                await db_manager.close()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,209 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from core.db import db_manager
+from dao.cache import CacheBackend, EntityCache, LRUTTLCache
+from dao.user_dao import UserDao
+from schemas.user import UserBulkUpdate, UserCreate, UserUpdate
+
+
+class DictBackend(CacheBackend):
+    """Хранилище кэша в словаре, без вытеснения и времени жизни."""
+
+    def __init__(self) -> None:  # noqa: D107
+        self.data: dict[str, dict[str, Any]] = {}
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        """Получение записи по ключу."""
+        return self.data.get(key)
+
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        """Сохранение записи по ключу."""
+        self.data[key] = value
+
+    async def delete(self, *keys: str) -> None:
+        """Удаление записей по ключам."""
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def clear(self) -> None:
+        """Удаление всех записей."""
+        self.data.clear()
+
+
+@pytest.fixture
+def dao() -> UserDao:
+    """DAO пользователей с кэшем в словаре."""
+
+    class CachedUserDao(UserDao):
+        cache = EntityCache(DictBackend())
+
+    return CachedUserDao()
+
+
+def cached_ids(dao: UserDao) -> set[int]:
+    """Идентификаторы записей в кэше DAO."""
+    return {int(key.split(':')[1]) for key in dao.cache.backend.data}
+
+
+async def create_users(dao: UserDao, *names: str) -> list[int]:
+    """Создание пользователей и чтение их через кэш; возвращает id."""
+    async with db_manager.session_with_commit() as session:
+        created, _ = await dao.bulk_create(
+            session,
+            [UserCreate(name=name, full_name='Old') for name in names],
+        )
+    ids = [user.id for user in created]
+    async with db_manager.session_read_only() as session:
+        for obj_id in ids:
+            await dao.get_one_or_none_by_id(session, obj_id)
+    return ids
+
+
+def test_entity_cache_counts_hits_and_misses() -> None:
+    """Подсчет попаданий и промахов кэша."""
+    cache = EntityCache(DictBackend())
+
+    async def scenario() -> None:
+        assert await cache.get('users', 1) is None
+        await cache.set('users', 1, {'id': 1})
+        assert await cache.get('users', 1) == {'id': 1}
+        assert await cache.get('users', 1) == {'id': 1}
+
+    asyncio.run(scenario())
+    assert cache.stats() == {'hits': 2, 'misses': 1}
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    """Вытеснение давно не использованной записи при превышении размера."""
+    backend = LRUTTLCache(maxsize=2, ttl=60)
+
+    async def scenario() -> None:
+        await backend.set('a', {'id': 1})
+        await backend.set('b', {'id': 2})
+        await backend.get('a')
+        await backend.set('c', {'id': 3})
+        assert await backend.get('b') is None
+        assert await backend.get('a') == {'id': 1}
+        assert await backend.get('c') == {'id': 3}
+
+    asyncio.run(scenario())
+    assert len(backend) == 2
+
+
+def test_ttl_expires_records(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Удаление записи по истечении времени жизни."""
+    backend = LRUTTLCache(maxsize=10, ttl=60)
+    now = [1000.0]
+    monkeypatch.setattr('dao.cache.time.monotonic', lambda: now[0])
+
+    async def scenario() -> None:
+        await backend.set('a', {'id': 1})
+        now[0] += 59
+        assert await backend.get('a') == {'id': 1}
+        now[0] += 1
+        assert await backend.get('a') is None
+
+    asyncio.run(scenario())
+    assert len(backend) == 0
+
+
+def test_create_invalidates(run_db: Any, dao: UserDao) -> None:
+    """Создание записи удаляет из кэша запись с тем же id."""
+
+    async def scenario() -> None:
+        await dao.cache.set('users', 1, {'id': 1, 'name': 'stale'})
+        async with db_manager.session_with_commit() as session:
+            user = await dao.create(session, UserCreate(name='a', full_name='New'))
+        assert user.id == 1
+        assert cached_ids(dao) == set()
+
+    run_db(scenario)
+
+
+def test_update_invalidates(run_db: Any, dao: UserDao) -> None:
+    """Изменение записи удаляет ее из кэша."""
+
+    async def scenario() -> None:
+        first, second = await create_users(dao, 'a', 'b')
+        async with db_manager.session_with_commit() as session:
+            await dao.update_by_id(session, first, UserUpdate(full_name='New'))
+            user = await dao.get_one_or_none_by_id(session, second)
+            await dao.update(session, user, UserUpdate(full_name='New'))
+        assert cached_ids(dao) == set()
+        async with db_manager.session_read_only() as session:
+            for obj_id in (first, second):
+                assert (await dao.get_one_or_none_by_id(session, obj_id)).full_name == 'New'
+
+    run_db(scenario)
+
+
+def test_delete_invalidates(run_db: Any, dao: UserDao) -> None:
+    """Удаление записи удаляет ее из кэша."""
+
+    async def scenario() -> None:
+        first, second = await create_users(dao, 'a', 'b')
+        async with db_manager.session_with_commit() as session:
+            assert await dao.delete_by_id(session, first)
+            await dao.delete(session, await dao.get_one_or_none_by_id(session, second))
+        assert cached_ids(dao) == set()
+        async with db_manager.session_read_only() as session:
+            assert await dao.get_one_or_none_by_id(session, first) is None
+            assert await dao.get_one_or_none_by_id(session, second) is None
+
+    run_db(scenario)
+
+
+def test_bulk_methods_invalidate(run_db: Any, dao: UserDao) -> None:
+    """Массовые операции удаляют измененные записи из кэша."""
+
+    async def scenario() -> None:
+        ids = await create_users(dao, 'a', 'b', 'c')
+        async with db_manager.session_with_commit() as session:
+            await dao.bulk_update(session, [UserBulkUpdate(id=ids[0], full_name='New')])
+        assert cached_ids(dao) == set(ids[1:])
+        async with db_manager.session_with_commit() as session:
+            await dao.bulk_delete(session, [ids[1]])
+        assert cached_ids(dao) == {ids[2]}
+
+        await dao.cache.set('users', ids[2] + 1, {'id': ids[2] + 1, 'name': 'stale'})
+        async with db_manager.session_with_commit() as session:
+            created, _ = await dao.bulk_create(session, [UserCreate(name='d', full_name='New')])
+        assert created[0].id == ids[2] + 1
+        assert cached_ids(dao) == {ids[2]}
+
+    run_db(scenario)
+
+
+def test_same_session_reads_own_write(run_db: Any, dao: UserDao) -> None:
+    """Сессия, изменившая запись, читает новые значения, а не кэш."""
+
+    async def scenario() -> None:
+        (obj_id,) = await create_users(dao, 'a')
+        async with db_manager.session_with_commit() as session:
+            updated = await dao.update_by_id(session, obj_id, UserUpdate(full_name='New'))
+            user = await dao.get_one_or_none_by_id(session, obj_id)
+            assert user.full_name == 'New'
+            assert updated.full_name == 'New'
+
+    run_db(scenario)
+
+
+def test_invalidates_again_after_commit(run_db: Any, dao: UserDao) -> None:
+    """Записи, возвращенные в кэш до коммита, удаляются после него."""
+
+    async def scenario() -> None:
+        (obj_id,) = await create_users(dao, 'a')
+        async with db_manager.session_with_commit() as session:
+            await dao.update_by_id(session, obj_id, UserUpdate(full_name='New'))
+            # Параллельное чтение до коммита возвращает в кэш старые значения
+            async with db_manager.session_read_only() as other:
+                assert (await dao.get_one_or_none_by_id(other, obj_id)).full_name == 'Old'
+            assert cached_ids(dao) == {obj_id}
+        assert cached_ids(dao) == set()
+        async with db_manager.session_read_only() as session:
+            assert (await dao.get_one_or_none_by_id(session, obj_id)).full_name == 'New'
+
+    run_db(scenario)